@@ -1,5 +1,8 @@
 from . import constants
 
+# command name -> command ID, reverse of `constants.COMMAND_IDS`
+_NAME_TO_ID = {name: value for value, name in constants.COMMAND_IDS.items()}
+
 
 class SequenceGenerator:
     """A sequence generator base class.
@@ -36,10 +39,10 @@ class SequenceGenerator:
 
     def next_sequence(self) -> int:
         """Increase and return current sequence."""
-        if self._sequence == self.MAX_SEQUENCE:
-            self._sequence = self.MIN_SEQUENCE
-        else:
-            self._sequence += 1
+        # wraps from MAX_SEQUENCE back to MIN_SEQUENCE
+        self._sequence = ((self._sequence - self.MIN_SEQUENCE + 1)
+                          % (self.MAX_SEQUENCE - self.MIN_SEQUENCE + 1)
+                          + self.MIN_SEQUENCE)
         return self._sequence
 
 
@@ -80,9 +83,7 @@ def cmd_name_to_id(command_name: str) -> int:
     Takes a command name argument, e.g "submit_sm" and returns its integer ID
     value, e.g 0X00000004.
     """
-    for value, name in constants.COMMAND_IDS.items():
-        if command_name == name:
-            return value
+    return _NAME_TO_ID.get(command_name)
 
 
 def pack_7bit(byte_string: bytes, padding: int = 0) -> bytes:
@@ -107,31 +108,16 @@ def pack_7bit(byte_string: bytes, padding: int = 0) -> bytes:
             be encoded as ASCII, or GSM 03.38 if more characters are required
         padding: Integer length to pad the results with
     """
-    byte_string = reversed(byte_string)
-    binary_string = []
-    for b in byte_string:
-        s = ""
-        for i in range(8):
-            s = ("%1d" % (b & 1)) + s
-            b >>= 1
-        binary_string.append(s[1:])
-    binary_string = "".join(binary_string)
-
-    for i in range(padding):
-        binary_string += "0"
+    # septets are stacked least significant first, i.e the first char ends up
+    # in the lowest 7 bits of the first octet
+    acc = 0
+    for i, b in enumerate(byte_string):
+        acc |= (b & 0x7F) << (7 * i)
+    acc <<= padding
 
     # zero extend last octet if needed
-    extra = len(binary_string) % 8
-    if extra > 0:
-        for i in range(8 - extra):
-            binary_string = "0" + binary_string
-
-    # convert back to bytes
-    packed_bytes = []
-    for i in range(0, len(binary_string), 8):
-        packed_bytes.append(int(binary_string[i:i + 8], 2))
-
-    return bytes(reversed(packed_bytes))
+    total_bits = 7 * len(byte_string) + padding
+    return acc.to_bytes((total_bits + 7) // 8, "little")
 
 
 def unpack_7bit(byte_string: bytes, padding: int = 0) -> bytes:
@@ -155,25 +141,10 @@ def unpack_7bit(byte_string: bytes, padding: int = 0) -> bytes:
          byte_string: Bytes to unpack
          padding: A length of padding to remove
     """
-    byte_string = reversed(byte_string)
-    binary_string = []
-    for b in byte_string:
-        s = ""
-        for i in range(8):
-            s = ("%1d" % (b & 1)) + s
-            b >>= 1
-        binary_string.append(s)
-    binary_string = "".join(binary_string)
-
-    if padding != 0:
-        binary_string = binary_string[:-padding]
-
-    unpacked_bytes = []
-    while len(binary_string) >= 7:
-        unpacked_bytes.append(int(binary_string[-7:], 2))
-        binary_string = binary_string[:-7]
-
-    return bytes(unpacked_bytes)
+    acc = int.from_bytes(byte_string, "little") >> padding
+    total_bits = 8 * len(byte_string) - padding
+
+    return bytes((acc >> (7 * i)) & 0x7F for i in range(total_bits // 7))
 
 
 from . import client
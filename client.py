@@ -174,7 +174,7 @@ import socket
 import struct
 import time
 
-from typing import Callable, Dict, Tuple
+from typing import Callable, Dict, Iterable, List, Tuple
 
 from . import constants
 from . import cmd_name_to_id
@@ -183,6 +183,11 @@ from .pdu import PDU
 
 logger = logging.getLogger("smpp.client")
 
+# initial size of the buffer incoming data is read into; every read takes as
+# much data as is available, so multiple PDUs that arrive together are read
+# with one system call. Grown on demand if a larger PDU arrives
+RECV_BUFFER_SIZE = 70000
+
 # list of command responses that trigger a change in session state
 SESSION_STATE_CHANGE_COMMANDS = {
     constants.CMD_BIND_TRANSMITTER_RESP: constants.SESSION_STATE_BOUND_TX,
@@ -190,6 +195,43 @@ SESSION_STATE_CHANGE_COMMANDS = {
     constants.CMD_BIND_TRANSCEIVER_RESP: constants.SESSION_STATE_BOUND_TRX,
     constants.CMD_UNBIND_RESP: constants.SESSION_STATE_OPEN}
 
+# scatter/gather writes are not available on every platform, e.g Windows
+HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+
+# session states allowed for each command, as sets for fast membership checks
+ALLOWED_SESSION_STATES = {
+    command_id: frozenset(states)
+    for command_id, states in constants.COMMAND_SESSION_STATES.items()}
+
+# incoming commands that are responded to automatically, with the command ID
+# of the response to send
+AUTO_RESPONSE_COMMANDS = {
+    constants.CMD_DELIVER_SM: constants.CMD_DELIVER_SM_RESP,
+    constants.CMD_ENQUIRE_LINK: constants.CMD_ENQUIRE_LINK_RESP,
+    constants.CMD_UNBIND: constants.CMD_UNBIND_RESP}
+
+# automatic responses have no variable parameters, so their encoded form is
+# built once: the first 8 header bytes (length and command ID) and the body,
+# command status and sequence number are filled in when sending
+AUTO_RESPONSE_TEMPLATES = {
+    command_id: (PDU.new(command_id).header[:8], PDU.new(command_id).body)
+    for command_id in AUTO_RESPONSE_COMMANDS.values()}
+
+# PDU header, and the status and sequence part of it on its own
+_HEADER = struct.Struct(">LLLL")
+_STATUS_SEQUENCE = struct.Struct(">LL")
+
+# incoming commands that require no further action, apart from the callback
+RECEIVE_ONLY_COMMANDS = {
+    constants.CMD_ALERT_NOTIFICATION,
+    constants.CMD_CANCEL_SM_RESP,
+    constants.CMD_DATA_SM_RESP,
+    constants.CMD_ENQUIRE_LINK_RESP,
+    constants.CMD_QUERY_SM_RESP,
+    constants.CMD_REPLACE_SM_RESP,
+    constants.CMD_SUBMIT_MULTI_RESP,
+    constants.CMD_SUBMIT_SM_RESP}
+
 
 class ClientLogAdapter(logging.LoggerAdapter):
     def process(self, msg: str, kwargs: dict):
@@ -214,14 +256,24 @@ class Client:
     def __init__(self, host: str, port: int, timeout: int = 5,
                  sequence_generator: SequenceGenerator = None,
                  logging_identifier: str = None,
-                 enquire_link_timeout: int = 30):
+                 enquire_link_timeout: int = 30,
+                 nodelay: bool = True,
+                 socket_buffer_size: int = 1048576):
         self.host = host
         self.port = port
         self.enquire_link_timeout = enquire_link_timeout
+        self.nodelay = nodelay
+        self.socket_buffer_size = socket_buffer_size
 
         self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._socket.settimeout(timeout)
-        self._inactivity_timer = time.time()
+        self._inactivity_timer = time.monotonic()
+
+        self._recv_buffer = bytearray(RECV_BUFFER_SIZE)
+        self._recv_view = memoryview(self._recv_buffer)
+        # start and end positions of data received but not yet parsed
+        self._recv_start = 0
+        self._recv_end = 0
 
         if sequence_generator is None:
             sequence_generator = SequenceGenerator()
@@ -254,7 +306,7 @@ class Client:
     @property
     def inactivity_time(self) -> int:
         """Time elapsed since last received PDU."""
-        return int(time.time() - self._inactivity_timer)
+        return int(time.monotonic() - self._inactivity_timer)
 
     def next_sequence(self) -> int:
         return self.sequence_generator.next_sequence()
@@ -315,69 +367,156 @@ class Client:
             raise CommandError("Bind request rejected", result_pdu.command_status)
         return result_pdu
 
-    def _send_pdu(self, pdu: PDU):
-        if self.state not in constants.COMMAND_SESSION_STATES[pdu.command_id]:
+    def _check_session_state(self, command_id: int):
+        """Raise if the command is not allowed in the current session state."""
+        if self.state not in ALLOWED_SESSION_STATES[command_id]:
             raise CommandError(
-                f"{pdu.command} command could not be sent",
+                f"{constants.COMMAND_IDS[command_id]} command could not be sent",
                 constants.ESME_RINVBNDSTS)
 
-        self.logger.info(f"sending {pdu.command} PDU")
+    def _send_pdu(self, pdu: PDU):
+        self._check_session_state(pdu.command_id)
 
-        raw_data = pdu.header + pdu.body
-        raw_data_length = len(raw_data)
+        self.logger.info("sending %s PDU", pdu.command)
 
-        if pdu.command_id in self.cb:
-            self.cb[pdu.command_id](pdu)
+        raw_data = (pdu.header, pdu.body)
 
-        total_sent = 0
-        while total_sent < raw_data_length:
-            try:
-                sent = self._socket.send(raw_data[total_sent:])
-                if sent == 0:
-                    raise SmppConnectionError(f"broken socket")
-                total_sent += sent
-            except socket.error as e:
-                raise SmppConnectionError(
-                    f"failed to write to socket at {total_sent} bytes sent: {e}")
+        callback = self.cb.get(pdu.command_id)
+        if callback is not None:
+            callback(pdu)
+
+        self._send_raw(raw_data)
+
+    def _send_response(self, command_id: int, command_status: int,
+                       sequence_number: int):
+        """Send one of the automatic responses.
+
+        Unless a callback has been set for the response command, in which case
+        the callback needs a PDU instance, the response is sent using its
+        pre-built template in `AUTO_RESPONSE_TEMPLATES` and no PDU instance is
+        created.
+        """
+        if command_id in self.cb:
+            self._send_pdu(PDU.new(command_id,
+                                   command_status=command_status,
+                                   sequence_number=sequence_number))
+            return
+
+        self._check_session_state(command_id)
+
+        self.logger.info("sending %s PDU", constants.COMMAND_IDS[command_id])
+
+        header, body = AUTO_RESPONSE_TEMPLATES[command_id]
+        self._send_raw((
+            header, _STATUS_SEQUENCE.pack(command_status, sequence_number), body))
 
-        self.logger.debug(f"sent {raw_data_length} bytes")
+    def _send_raw(self, raw_data: Tuple[bytes, ...]):
+        """Write encoded PDU parts to the socket.
+
+        Where supported, the parts are handed over to the socket as they are,
+        using scatter/gather I/O, instead of concatenating them first.
+        """
+        length = sum(len(part) for part in raw_data)
+        try:
+            if HAS_SENDMSG:
+                sent = self._socket.sendmsg(raw_data)
+                if sent < length:
+                    self._socket.sendall(b"".join(raw_data)[sent:])
+            else:
+                self._socket.sendall(b"".join(raw_data))
+        except socket.error as e:
+            raise SmppConnectionError(f"failed to write to socket: {e}")
+
+        self.logger.debug("sent %d bytes", length)
+
+    def _recv_into_buffer(self, length: int):
+        """Ensure that at least `length` unparsed bytes are in receive buffer.
+
+        Reads from the socket as long as the buffer holds less than the
+        requested amount of data. Every read takes as much as the buffer has
+        room for, so data that arrives in bursts is received with one read and
+        subsequent PDUs are served from the buffer.
+        """
+        available = self._recv_end - self._recv_start
+        if available >= length:
+            return
+
+        if self._recv_start + length > len(self._recv_buffer):
+            # not enough room left at the end, move unparsed data to the start
+            if length > len(self._recv_buffer):
+                buffer = bytearray(length)
+                buffer[:available] = self._recv_view[self._recv_start:self._recv_end]
+                self._recv_buffer = buffer
+                self._recv_view = memoryview(buffer)
+            else:
+                self._recv_buffer[:available] = self._recv_buffer[
+                    self._recv_start:self._recv_end]
+            self._recv_start = 0
+            self._recv_end = available
+
+        while self._recv_end - self._recv_start < length:
+            read = self._socket.recv_into(self._recv_view[self._recv_end:])
+            if not read:
+                raise SmppConnectionError(f"broken socket")
+            self._recv_end += read
 
     def _read_pdu(self) -> Tuple[PDU, int]:
         self.logger.debug("waiting for PDU")
 
+        # partially received data stays in the buffer on timeout, reading will
+        # continue from where it was left on the next call
         try:
-            raw_length = self._socket.recv(4)
+            self._recv_into_buffer(4)
         except socket.timeout:
             # raising this separately so that action can be taken on timeout
             raise
         except socket.error as e:
             raise SmppConnectionError(f"failed to read from socket: {e}")
-        if not raw_length:
-            raise SmppConnectionError(f"broken socket")
+
+        read_length = int.from_bytes(
+            self._recv_view[self._recv_start:self._recv_start + 4], "big")
+        if read_length < 16:
+            # drop the length bytes, so that the next read does not run into
+            # the same invalid length again
+            self._recv_start += 4
+            if self._recv_start == self._recv_end:
+                self._recv_start = self._recv_end = 0
+            raise PduParseError(f"Invalid command length: {read_length}")
 
         try:
-            read_length = struct.unpack(">L", raw_length)[0]
-        except struct.error:
-            raise PduParseError(f"Invalid command length: {repr(raw_length)}")
+            self._recv_into_buffer(read_length)
+        except socket.timeout:
+            raise
+        except socket.error as e:
+            raise SmppConnectionError(f"failed to read from socket: {e}")
 
-        raw_body = self._socket.recv(read_length - 4)
-        raw_data = raw_length + raw_body
+        raw_data = bytes(
+            self._recv_view[self._recv_start:self._recv_start + read_length])
+        self._recv_start += read_length
+        if self._recv_start == self._recv_end:
+            self._recv_start = self._recv_end = 0
+            # a buffer grown for an oversized PDU is not kept around
+            if len(self._recv_buffer) > RECV_BUFFER_SIZE:
+                self._recv_buffer = bytearray(RECV_BUFFER_SIZE)
+                self._recv_view = memoryview(self._recv_buffer)
 
-        self.logger.debug(f"read {len(raw_data)} bytes")
-        self._inactivity_timer = time.time()
+        self.logger.debug("read %d bytes", read_length)
+        self._inactivity_timer = time.monotonic()
 
         pdu = PDU.new_from_raw(raw_data)
-        self.logger.debug(f"parsed a {pdu.command} command PDU")
+        self.logger.debug("parsed a %s command PDU", pdu.command)
 
-        if pdu.ok and pdu.command_id in SESSION_STATE_CHANGE_COMMANDS:
-            self.state = SESSION_STATE_CHANGE_COMMANDS[pdu.command_id]
-            self.logger.debug(
-                f"session state changing to {constants.SESSION_STATE_NAMES[self.state]}")
+        command_id = pdu.command_id
+        if pdu.ok and command_id in SESSION_STATE_CHANGE_COMMANDS:
+            self.state = SESSION_STATE_CHANGE_COMMANDS[command_id]
+            self.logger.debug("session state changing to %s",
+                              constants.SESSION_STATE_NAMES[self.state])
 
         return_status = constants.ESME_ROK
 
-        if pdu.command_id in self.cb:
-            cb_status = self.cb[pdu.command_id](pdu)
+        callback = self.cb.get(command_id)
+        if callback is not None:
+            cb_status = callback(pdu)
             if cb_status is not None:
                 return_status = cb_status
 
@@ -389,6 +528,18 @@ class Client:
         try:
             if self._socket is None:
                 self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # PDUs are small and sent one at a time, do not let Nagle hold
+            # them back waiting for more data
+            if self.nodelay:
+                self._socket.setsockopt(
+                    socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # buffer sizes have to be set before connecting, in order for the
+            # TCP window to be negotiated accordingly
+            if self.socket_buffer_size:
+                self._socket.setsockopt(
+                    socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_buffer_size)
+                self._socket.setsockopt(
+                    socket.SOL_SOCKET, socket.SO_SNDBUF, self.socket_buffer_size)
             self._socket.connect((self.host, self.port))
             self.state = constants.SESSION_STATE_OPEN
         except socket.error as e:
@@ -404,6 +555,8 @@ class Client:
         if self._socket is not None:
             self._socket.close()
             self._socket = None
+        # anything left unparsed belonged to the closed connection
+        self._recv_start = self._recv_end = 0
 
         self.state = constants.SESSION_STATE_CLOSED
 
@@ -437,74 +590,40 @@ class Client:
                 self._send_pdu(pdu)
             return True
 
-        if not pdu.ok:
-            self.logger.warning(f"received {pdu.command} with a NOK "
-                                f"status {hex(pdu.command_status)}")
-
-        if pdu.command_id == constants.CMD_ALERT_NOTIFICATION:
-            self.logger.info("received alert_notification command")
-
-        elif pdu.command_id == constants.CMD_CANCEL_SM_RESP:
-            self.logger.info("received cancel_sm_resp command")
-
-        elif pdu.command_id == constants.CMD_DATA_SM_RESP:
-            self.logger.info("received data_sm_resp command")
-
-        elif pdu.command_id == constants.CMD_DELIVER_SM:
-            self.logger.info("received deliver_sm command")
-
-            response_pdu = PDU.new(
-                constants.CMD_DELIVER_SM_RESP,
-                command_status=return_status,
-                sequence_number=pdu.sequence_number)
-
-            self._send_pdu(response_pdu)
-            self.logger.debug("responded with deliver_sm_resp")
-
-        elif pdu.command_id == constants.CMD_ENQUIRE_LINK:
-            self.logger.info("received enquire_link command")
-
-            response_pdu = PDU.new(
-                constants.CMD_ENQUIRE_LINK_RESP,
-                sequence_number=pdu.sequence_number)
-
-            self._send_pdu(response_pdu)
-            self.logger.debug("responded with enquire_link_resp")
-
-        elif pdu.command_id == constants.CMD_ENQUIRE_LINK_RESP:
-            self.logger.info("received enquire_link_resp command")
+        logger = self.logger
+        command_id = pdu.command_id
+        command = pdu.command
 
-        elif pdu.command_id == constants.CMD_QUERY_SM_RESP:
-            self.logger.info("received query_sm_resp command")
-
-        elif pdu.command_id == constants.CMD_REPLACE_SM_RESP:
-            self.logger.info("received replace_sm_resp command")
-
-        elif pdu.command_id == constants.CMD_SUBMIT_MULTI_RESP:
-            self.logger.info("received submit_multi_resp command")
+        if not pdu.ok:
+            logger.warning("received %s with a NOK status %#x",
+                           command, pdu.command_status)
 
-        elif pdu.command_id == constants.CMD_SUBMIT_SM_RESP:
-            self.logger.info("received submit_sm_resp command")
+        # submit_sm_resp and deliver_sm (the first auto response) make up most
+        # of the traffic in a typical session, keep their checks first
+        if command_id == constants.CMD_SUBMIT_SM_RESP:
+            logger.info("received %s command", command)
 
-        elif pdu.command_id == constants.CMD_UNBIND:
-            self.logger.info("received unbind command")
+        elif command_id in AUTO_RESPONSE_COMMANDS:
+            logger.info("received %s command", command)
 
-            response_pdu = PDU.new(
-                constants.CMD_UNBIND_RESP,
-                sequence_number=pdu.sequence_number)
+            response_id = AUTO_RESPONSE_COMMANDS[command_id]
+            self._send_response(
+                response_id, return_status, pdu.sequence_number)
+            logger.debug("responded with %s", constants.COMMAND_IDS[response_id])
 
-            self._send_pdu(response_pdu)
-            self.logger.debug("responded with unbind_resp, exiting")
+            if command_id == constants.CMD_UNBIND:
+                logger.debug("unbound by SMSC, exiting")
+                return False
 
+        elif command_id == constants.CMD_UNBIND_RESP:
+            logger.info("received unbind_resp command, exiting")
             return False
 
-        elif pdu.command_id == constants.CMD_UNBIND_RESP:
-            self.logger.info("received unbind_resp command, exiting")
-            return False
+        elif command_id in RECEIVE_ONLY_COMMANDS:
+            logger.info("received %s command", command)
 
         else:
-            self.logger.warning(
-                f"received an unnhandled SMPP command {pdu.command}")
+            logger.warning("received an unnhandled SMPP command %s", command)
 
         return True
 
@@ -563,6 +682,65 @@ class Client:
         self._send_pdu(pdu)
         return pdu
 
+    def submit_sm_batch(self, destination_addrs: Iterable[str],
+                        **kwargs) -> List[int]:
+        """Submit the same short message to multiple destinations.
+
+        Sends a separate submit_sm PDU to each of the destination addresses.
+        The PDU body is encoded only once, only the destination address and the
+        header are encoded again for each destination. Each PDU receives a new
+        sequence number from the sequence generator.
+
+        If a callback has been set for submit_sm, it is called once for each
+        destination, with a separate PDU instance for each, containing the
+        destination address and sequence number of the PDU being sent.
+
+        >>> esme.submit_sm_batch(["4178481818", "4178481819"],
+        >>>                      source_addr="sender", short_message=b"test")
+
+        Args:
+            destination_addrs: Addresses to send the message to
+            **kwargs: Any other submit_sm parameters, except for
+                `destination_addr` and `sequence_number`, which are set for
+                each destination
+
+        Returns:
+            Sequence numbers of the sent PDUs, in the same order as the
+            destination addresses.
+        """
+        for name in ("destination_addr", "sequence_number"):
+            if name in kwargs:
+                raise ValueError(f"{name} cannot be given for a batch, it is "
+                                 f"set for each destination")
+
+        self._check_session_state(constants.CMD_SUBMIT_SM)
+
+        pdu = PDU.new(constants.CMD_SUBMIT_SM, **kwargs)
+        before, after = pdu.body_around("destination_addr")
+        destination_param = pdu.params["destination_addr"]
+        callback = self.cb.get(pdu.command_id)
+
+        sequences = []
+        for destination_addr in destination_addrs:
+            sequence = self.sequence_generator.next_sequence()
+            destination = destination_param.encode_value(destination_addr)
+
+            self.logger.info("sending %s PDU", pdu.command)
+            if callback is not None:
+                # callbacks may keep the PDU around, e.g to match responses
+                callback(PDU.new(constants.CMD_SUBMIT_SM,
+                                 sequence_number=sequence,
+                                 destination_addr=destination_addr,
+                                 **kwargs))
+
+            header = _HEADER.pack(
+                len(before) + len(destination) + len(after) + 16,
+                pdu.command_id, pdu.command_status, sequence)
+            self._send_raw((header, before, destination, after))
+            sequences.append(sequence)
+
+        return sequences
+
     def submit_sm_multi(self, **kwargs) -> PDU:
         pdu = PDU.new(constants.CMD_SUBMIT_MULTI,
                       sequence_generator=self.sequence_generator,
@@ -1,4 +1,5 @@
 import codecs
+import functools
 from typing import Tuple
 
 # data from
@@ -181,65 +182,141 @@ CHARS_UNICODE_TO_GSM = {u: g for g, u in CHARS_GSM_TO_UNICODE.items()}
 ESCAPED_CHARS_UNICODE_TO_GSM = {u: g for g, u in ESCAPED_CHARS_GSM_TO_UNICODE.items()}
 
 
+# unicode code point -> GSM 03.38 translation table for `str.translate`,
+# escaped characters included with their escape prefix. Characters in the
+# ASCII range that have no GSM 03.38 equivalent are mapped to a non-ASCII
+# placeholder, so that a translated text is pure ASCII only if every character
+# could be encoded
+_ENCODE_TABLE = {c: "\ufffd" for c in range(0x80)}
+_ENCODE_TABLE.update({ord(u): "\x1b" + g for u, g in ESCAPED_CHARS_UNICODE_TO_GSM.items()})
+_ENCODE_TABLE.update({ord(u): g for u, g in CHARS_UNICODE_TO_GSM.items()})
+
+
+# ASCII -> GSM 03.38 table for `bytes.translate`, for the common case of
+# plain ASCII text. Characters that need to be escaped or have no GSM 03.38
+# equivalent map to 0xFF, which is never a valid GSM 03.38 byte
+_ASCII_ENCODE_TABLE = bytes(
+    ord(CHARS_UNICODE_TO_GSM.get(chr(c), "\xff")) for c in range(0x80)
+) + b"\xff" * 0x80
+
+
+class _TranslateTable(dict):
+    """A `str.translate` table with a default for characters not in it."""
+    def __init__(self, table: dict, default: str):
+        super().__init__(table)
+        self.default = default
+
+    def __missing__(self, key: int) -> str:
+        return self.default
+
+
+def _error_table(default: str, replaced: dict = None) -> _TranslateTable:
+    table = {ord(u): g for u, g in (replaced or {}).items()}
+    table.update({ord(u): "\x1b" + g for u, g in ESCAPED_CHARS_UNICODE_TO_GSM.items()})
+    table.update({ord(u): g for u, g in CHARS_UNICODE_TO_GSM.items()})
+    return _TranslateTable(table, default)
+
+
+# translation tables for texts that contain characters with no GSM 03.38
+# equivalent, per non-strict error handling
+_ERROR_ENCODE_TABLES = {
+    "replace": _error_table(QUESTION_MARK, REPLACED_CHARS_GSM_TO_UNICODE),
+    "ignore": _error_table(""),
+}
+
+
+# message texts are often repeated, e.g when sent from templates, so results
+# of the most recent encodings and decodings are kept around. Exceptions are
+# never cached
+_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
 def encode(text: str, errors: str = "strict") -> Tuple[bytes, int]:
-    result = []
-    for c in text:
-        try:
-            result.append(CHARS_UNICODE_TO_GSM[c])
-        except KeyError:
-            if c in ESCAPED_CHARS_UNICODE_TO_GSM:
-                result.append("\x1b")
-                result.append(ESCAPED_CHARS_UNICODE_TO_GSM[c])
-            else:
-                if errors == "strict":
-                    raise UnicodeError("Invalid GSM character")
-                elif errors == "replace":
-                    result.append(REPLACED_CHARS_GSM_TO_UNICODE.get(c, QUESTION_MARK))
-                elif errors == "ignore":
-                    pass
-                else:
-                    raise UnicodeError("Unknown error handling")
-    encoded = "".join(result)
+    if text.isascii():
+        encoded = text.encode("ascii").translate(_ASCII_ENCODE_TABLE)
+        if b"\xff" not in encoded:
+            return encoded, len(encoded)
+
+    encoded = text.translate(_ENCODE_TABLE)
+    if not encoded.isascii():
+        # at least one character has no GSM 03.38 equivalent, translate again
+        # with the requested error handling
+        table = _ERROR_ENCODE_TABLES.get(errors)
+        if table is None and errors == "strict":
+            raise UnicodeError("Invalid GSM character")
+        elif table is None:
+            raise UnicodeError("Unknown error handling")
+        encoded = text.translate(table)
     return encoded.encode(), len(encoded)
 
 
+# GSM 03.38 -> unicode decoding tables for `codecs.charmap_decode`, applied on
+# data that contains no escape sequences, indexed by byte value. U+FFFE marks
+# bytes that are not valid, i.e the escape character and anything above 0x7F
+_DECODE_TABLE = "".join(CHARS_GSM_TO_UNICODE.get(chr(c), "\ufffe")
+                        for c in range(0x80)) + "\ufffe" * 0x80
+_DECODE_TABLE_REPLACE = _DECODE_TABLE[:0x80] + "?" * 0x80
+
+# escaped GSM 03.38 -> unicode, indexed by the byte value following the escape
+_ESCAPED_DECODE_TABLE = tuple(ESCAPED_CHARS_GSM_TO_UNICODE.get(chr(c), "\xa0")
+                              for c in range(0x100))
+
+
+def _decode_unescaped(data: bytes, errors: str) -> str:
+    if data.isascii():
+        table = _DECODE_TABLE
+    elif errors == "strict":
+        raise UnicodeError("Unrecognized GSM character")
+    elif errors == "replace":
+        table = _DECODE_TABLE_REPLACE
+    elif errors == "ignore":
+        return codecs.charmap_decode(data, "ignore", _DECODE_TABLE)[0]
+    else:
+        raise UnicodeError("Unknown error handling")
+    return codecs.charmap_decode(data, "strict", table)[0]
+
+
 def decode(data: bytes, errors: str = "strict") -> Tuple[str, int]:
+    # the codec machinery passes in memoryviews, which are not hashable
+    return _decode(bytes(data), errors)
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _decode(data: bytes, errors: str) -> Tuple[str, int]:
+    if b"\x1b" not in data:
+        decoded = _decode_unescaped(data, errors)
+        return decoded, len(decoded)
+
     result = []
     index = 0
-    while index < len(data):
-        c = data[index]
-        index += 1
-
-        if c == 0x1b:
-            if index < len(data):
-                c = data[index]
-                index += 1
-                result.append(ESCAPED_CHARS_GSM_TO_UNICODE.get(chr(c), "\xa0"))
-            else:
-                result.append("\xa0")
+    data_length = len(data)
+    while True:
+        # translate everything up to the next escape in one go, then handle
+        # the escaped character that follows
+        escape_index = data.find(b"\x1b", index)
+        if escape_index < 0:
+            result.append(_decode_unescaped(data[index:], errors))
+            break
+
+        result.append(_decode_unescaped(data[index:escape_index], errors))
+        if escape_index + 1 < data_length:
+            result.append(_ESCAPED_DECODE_TABLE[data[escape_index + 1]])
         else:
-            try:
-                result.append(CHARS_GSM_TO_UNICODE[chr(c)])
-            except KeyError:
-                if errors == "strict":
-                    raise UnicodeError("Unrecognized GSM character")
-                elif errors == "replace":
-                    result.append("?")
-                elif errors == "ignore":
-                    pass
-                else:
-                    raise UnicodeError("Unknown error handling")
+            result.append("\xa0")
+        index = escape_index + 2
 
     decoded = "".join(result)
     return decoded, len(decoded)
 
 
 # encodings module API
+_CODEC_INFO = codecs.CodecInfo(name="gsm0338", encode=encode, decode=decode)
+
+
 def getregentry(encoding):
     if encoding == "gsm0338":
-        return codecs.CodecInfo(name="gsm0338",
-                                encode=encode,
-                                decode=decode)
+        return _CODEC_INFO
 
 
 codecs.register(getregentry)
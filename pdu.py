@@ -24,6 +24,7 @@ Sample usage:
 """
 from __future__ import annotations
 
+import itertools
 import logging
 import struct
 from typing import Any, Dict, List, Optional, Tuple, Type, Union
@@ -33,6 +34,17 @@ from . import PduParseError, SequenceGenerator
 
 logger = logging.getLogger("smpp.pdu")
 
+# precompiled structs for the command header, TLV headers and integer values,
+# so that the format strings are not parsed again for each (un)packed value
+_HEADER = struct.Struct(">LLLL")
+_TLV_HEADER = struct.Struct(">HH")
+# int, short, long
+_INT_FORMATS = {1: "B", 2: "H", 4: "L"}
+_INT_STRUCTS = {size: struct.Struct(f">{fmt}")
+                for size, fmt in _INT_FORMATS.items()}
+_INT_TLV_STRUCTS = {size: struct.Struct(f">HH{fmt}")
+                    for size, fmt in _INT_FORMATS.items()}
+
 # supported TLVs
 OPTIONAL_PARAM_TAGS = {
     "dest_addr_subunit": 0x0005,
@@ -42,10 +54,10 @@ OPTIONAL_PARAM_TAGS = {
     "source_addr_subunit": 0x000D,
     "source_network_type": 0x000E,
     "source_bearer_type": 0x000F,
-    "source_telematics_id": 0x010,
+    "source_telematics_id": 0x0010,
     "qos_time_to_live": 0x0017,
     "payload_type": 0x0019,
-    "additional_status_info_text": 0x01D,
+    "additional_status_info_text": 0x001D,
     "receipted_message_id": 0x001E,
     "ms_msg_wait_facilities": 0x0030,
     "privacy_indicator": 0x0201,
@@ -81,10 +93,35 @@ OPTIONAL_PARAM_TAGS = {
     "its_session_info": 0x1383}
 
 
-def _field_tag_to_name(tag_value: str) -> str:
-    for tag_name, value in OPTIONAL_PARAM_TAGS.items():
-        if value == tag_value:
-            return tag_name
+# TLV tag value -> name, reverse of `OPTIONAL_PARAM_TAGS`
+OPTIONAL_PARAM_TAG_NAMES = {v: k for k, v in OPTIONAL_PARAM_TAGS.items()}
+
+
+def _is_mandatory_int(param: Param) -> bool:
+    return (type(param) is IntegerParam and not param.is_optional and
+            param.size in _INT_FORMATS)
+
+
+_ParamLayout = List[Tuple[Tuple[str, ...], Optional[struct.Struct]]]
+
+
+def _param_layout(params: Dict[str, Param]) -> _ParamLayout:
+    """Group command parameters for parsing.
+
+    Runs of consecutive mandatory integer parameters are grouped together with
+    a struct that unpacks all of them at once, every other parameter is on its
+    own with no struct.
+    """
+    layout = []
+    for is_int, group in itertools.groupby(params.values(), _is_mandatory_int):
+        group = list(group)
+        if is_int and len(group) > 1:
+            fmt = "".join(_INT_FORMATS[p.size] for p in group)
+            layout.append((tuple(p.field_name for p in group),
+                           struct.Struct(f">{fmt}")))
+        else:
+            layout.extend(((p.field_name,), None) for p in group)
+    return layout
 
 
 class PDU:
@@ -100,8 +137,11 @@ class PDU:
     """Fields available for the PDU. These are also accessible as direct 
     attributes of the PDU instance."""
 
-    params_config: List[Tuple[str, Type[Param], Union[dict, list]]]
+    params_config: Tuple[Tuple[str, Type[Param], Union[dict, list]], ...]
     need_sequence: bool = False
+    _param_prototypes: Dict[str, Param] = {}
+    _param_layout: _ParamLayout = []
+    _length_params: Tuple[Tuple[str, str], ...] = ()
 
     def __setattr__(self, item, value):
         if item in self.params:
@@ -116,15 +156,37 @@ class PDU:
             return self.params[item].data
         raise AttributeError
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "command_id" in cls.__dict__:
+            cls.command = constants.COMMAND_IDS.get(cls.command_id)
+        # never modified in place, see `define_optional_param`
+        if "params_config" in cls.__dict__:
+            cls.params_config = tuple(cls.params_config)
+        cls._build_param_prototypes()
+
     def __init__(self, **kwargs):
-        self.__dict__["params"] = {}
+        # none of these are parameters, so skip __setattr__
+        attrs = self.__dict__
+        attrs["params"] = {field_name: p.copy()
+                           for field_name, p in self._param_prototypes.items()}
+        attrs["_encoded_body"] = None
+        attrs["command_status"] = constants.ESME_ROK
+        attrs["sequence_number"] = 0
 
-        self._encoded_body = None
+        for key, value in kwargs.items():
+            setattr(self, key, value)
 
-        self.command_status = constants.ESME_ROK
-        self.sequence_number = 0
+    @classmethod
+    def _build_param_prototypes(cls):
+        """Configure the parameters of the command.
 
-        for field_name, param, param_config in self.params_config:
+        Done once for each command class, new instances receive copies of the
+        configured parameters. Has to be called again if `params_config` is
+        replaced.
+        """
+        prototypes = {}
+        for field_name, param, param_config in getattr(cls, "params_config", []):
             if issubclass(param, ListParam):
                 p = param(param_config)
             else:
@@ -137,13 +199,29 @@ class PDU:
                 p.is_optional = True
                 p.field_tag = OPTIONAL_PARAM_TAGS[field_name]
 
-            self.params[field_name] = p
+            prototypes[field_name] = p
 
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        cls._param_prototypes = prototypes
+        cls._param_layout = _param_layout(prototypes)
+        # (length parameter, parameter) pairs, e.g sm_length and short_message.
+        # TLVs carry their own length in the TLV header, so only mandatory
+        # parameters are linked, and only to length parameters that exist
+        cls._length_params = tuple(
+            (p.len_param, field_name) for field_name, p in prototypes.items()
+            if p.len_param and not p.is_optional and p.len_param in prototypes)
 
     def _prepare_body(self):
-        pass
+        self._set_lengths(self.params, {})
+
+    def _set_lengths(self, params: Dict[str, Param], known: Dict[str, Any]):
+        # length parameters always follow the current value of their parameter;
+        # values the caller already read are passed in ``known``
+        for len_param, field_name in self._length_params:
+            if field_name in known:
+                data = known[field_name]
+            else:
+                data = params[field_name].data
+            params[len_param].data = len(data) if data else 0
 
     def _set_sequence(self, sequence: int):
         self.sequence_number = sequence
@@ -156,9 +234,8 @@ class PDU:
         the entire PDU (including header), the command ID, the command status
         and the sequence number.
         """
-        return struct.pack(">LLLL",
-                           len(self.body) + 16, self.command_id,
-                           self.command_status, self.sequence_number)
+        return _HEADER.pack(len(self.body) + 16, self.command_id,
+                            self.command_status, self.sequence_number)
 
     @property
     def body(self) -> bytes:
@@ -174,26 +251,37 @@ class PDU:
 
         self._prepare_body()
 
-        b = b""
-        for param in self.params.values():
-            encoded_param = param.encoded
-            # TLVs are always optional
-            if param.is_optional and encoded_param:
-                # print(f"adding {param.field_name} with value {encoded_param} (optional)")
-                b += encoded_param
-            elif not param.is_optional:
-                # ostr may not return data
-                if param.has_optional_value and encoded_param:
-                    # print(f"adding {param.field_name} with value {encoded_param}")
-                    b += encoded_param
-                else:
-                    # print(f"adding {param.field_name} with value {encoded_param}")
-                    b += encoded_param
-
-        self._encoded_body = b
+        # unset TLVs and octet strings do not return data
+        self._encoded_body = b"".join(
+            filter(None, [param.encode_value(param.data)
+                          for param in self.params.values()]))
 
         return self._encoded_body
 
+    def body_around(self, field_name: str) -> Tuple[bytes, bytes]:
+        """Encode PDU body in two parts, around one parameter.
+
+        Returns the encoded parameters before and after the parameter
+        `field_name`, which itself is left out. Allows sending the same PDU
+        repeatedly with only the one parameter changing, without encoding
+        every other parameter again.
+        """
+        if field_name not in self.params:
+            raise ValueError(f"{self.command} has no parameter {field_name}")
+
+        self._prepare_body()
+
+        parts = ([], [])
+        current = parts[0]
+        for name, param in self.params.items():
+            if name == field_name:
+                current = parts[1]
+                continue
+            current.append(param.encode_value(param.data))
+
+        before, after = parts
+        return b"".join(filter(None, before)), b"".join(filter(None, after))
+
     @classmethod
     def new(cls, command_id: int, sequence_generator: SequenceGenerator = None,
             **kwargs: Any) -> PDU:
@@ -231,40 +319,11 @@ class PDU:
             `constants.CMD_UNBIND` would return an instance of `Unbind`.
 
         """
-        commands = {
-            constants.CMD_ALERT_NOTIFICATION: AlertNotification,
-            constants.CMD_BIND_RECEIVER: BindReceiver,
-            constants.CMD_BIND_RECEIVER_RESP: BindReceiverResp,
-            constants.CMD_BIND_TRANSCEIVER: BindTransceiver,
-            constants.CMD_BIND_TRANSCEIVER_RESP: BindTransceiverResp,
-            constants.CMD_BIND_TRANSMITTER: BindTransmitter,
-            constants.CMD_BIND_TRANSMITTER_RESP: BindTransmitterResp,
-            constants.CMD_CANCEL_SM: CancelSm,
-            constants.CMD_CANCEL_SM_RESP: CancelSmResp,
-            constants.CMD_DATA_SM: DataSm,
-            constants.CMD_DATA_SM_RESP: DataSmResp,
-            constants.CMD_DELIVER_SM: DeliverSm,
-            constants.CMD_DELIVER_SM_RESP: DeliverSmResp,
-            constants.CMD_ENQUIRE_LINK: EnquireLink,
-            constants.CMD_ENQUIRE_LINK_RESP: EnquireLinkResp,
-            constants.CMD_GENERIC_NACK: GenericNack,
-            constants.CMD_QUERY_SM: QuerySm,
-            constants.CMD_QUERY_SM_RESP: QuerySmResp,
-            constants.CMD_REPLACE_SM: ReplaceSm,
-            constants.CMD_REPLACE_SM_RESP: ReplaceSmResp,
-            constants.CMD_SUBMIT_MULTI: SubmitMulti,
-            constants.CMD_SUBMIT_MULTI_RESP: SubmitMultiResp,
-            constants.CMD_SUBMIT_SM: SubmitSm,
-            constants.CMD_SUBMIT_SM_RESP: SubmitSmResp,
-            constants.CMD_UNBIND: Unbind,
-            constants.CMD_UNBIND_RESP: UnbindResp}
-
-        if command_id not in commands:
+        cmd_class = _COMMAND_CLASSES.get(command_id)
+        if cmd_class is None:
             raise PduParseError(f"Invalid command code {hex(command_id)}")
 
-        cmd = commands[command_id](**kwargs)
-        cmd.command = constants.COMMAND_IDS[command_id]
-        cmd.command_id = command_id
+        cmd = cmd_class(**kwargs)
 
         if cmd.need_sequence and sequence_generator and "sequence_number" not in kwargs:
             cmd._set_sequence(sequence_generator.next_sequence())
@@ -275,8 +334,7 @@ class PDU:
     def new_from_raw(cls, raw_data: bytes) -> PDU:
         """Parse raw PDU bytes into a PDU instance."""
         try:
-            length, command_id, status, sequence = struct.unpack(
-                ">LLLL", raw_data[:16])
+            length, command_id, status, sequence = _HEADER.unpack_from(raw_data)
         except struct.error as e:
             raise PduParseError(f"PDU has invalid header: {e}")
         cmd = PDU.new(command_id, command_status=status, sequence_number=sequence)
@@ -287,41 +345,57 @@ class PDU:
 
         pos = 16
 
-        # first do mandatory parameters in pre-determined order
-        for param in cmd.params.values():
-            length = None
+        cmd_params = cmd.params
 
+        # first do mandatory parameters in pre-determined order
+        for field_names, run in cmd._param_layout:
             if pos >= data_length:
                 break
-            if param.is_optional:
+            if run is not None and pos + run.size <= data_length:
+                values = run.unpack_from(raw_data, pos)
+                for field_name, value in zip(field_names, values):
+                    cmd_params[field_name].data = value
+                pos += run.size
+                continue
+            if cmd_params[field_names[0]].is_optional:
                 break
-            if param.len_param:
-                length = cmd.params[param.len_param].data
 
-            pos = param.extract_from_data(raw_data, pos, length)
+            # a single parameter, or a run of integers cut short by the end of
+            # the data
+            for field_name in field_names:
+                if pos >= data_length:
+                    break
+                param = cmd_params[field_name]
+                length = None
+                if param.len_param:
+                    length = cmd_params[param.len_param].data
+
+                pos = param.extract_from_data(raw_data, pos, length)
 
         # then do TLVs until data is exhausted
+        unpack_tlv_header = _TLV_HEADER.unpack_from
+        get_tag_name = OPTIONAL_PARAM_TAG_NAMES.get
         while pos < data_length:
-            field_tag, length = struct.unpack(">HH", raw_data[pos:pos + 4])
-            param_name = _field_tag_to_name(field_tag)
+            field_tag, length = unpack_tlv_header(raw_data, pos)
+            param_name = get_tag_name(field_tag)
 
             if not param_name:
-                logger.warning(f"unknown TLV tag value '{field_tag}' with "
-                               f"length {length} at position {pos}; ignored")
+                logger.warning("unknown TLV tag value '%s' with length %s at "
+                               "position %s; ignored", field_tag, length, pos)
                 # spec says ignore unknown optional parameters
                 pos += 4 + length
                 continue
 
-            if param_name not in cmd.params:
-                logger.warning(f"unexpected TLV tag '{param_name}' "
-                               f"({hex(field_tag)} at position {pos}; not part "
-                               f"of {cmd.command} definition; ignored")
+            param = cmd_params.get(param_name)
+            if param is None:
+                logger.warning("unexpected TLV tag '%s' (%s at position %s; not "
+                               "part of %s definition; ignored", param_name,
+                               hex(field_tag), pos, cmd.command)
                 # spec says ignore unexpected optional parameters
                 pos += 4 + length
                 continue
 
             pos += 4  # skip header
-            param = cmd.params[param_name]
             pos = param.extract_from_data(raw_data, pos, length)
 
         return cmd
@@ -334,7 +408,8 @@ class PDU:
 
 class Param:
     """An individual PDU parameter definition."""
-    has_optional_value = False
+    __slots__ = ("size", "min_len", "max_len", "field_name", "is_optional",
+                 "field_tag", "len_param", "_data")
 
     def __init__(self, size: int = None, min_len: int = None, max_len: int = None,
                  len_param: str = None, initial: Any = None,
@@ -361,8 +436,29 @@ class Param:
     def data(self, value):
         self._data = value
 
+    def copy(self) -> Param:
+        """Create a copy of the parameter, including its current value."""
+        clone = object.__new__(self.__class__)
+        clone.size = self.size
+        clone.min_len = self.min_len
+        clone.max_len = self.max_len
+        clone.field_name = self.field_name
+        clone.is_optional = self.is_optional
+        clone.field_tag = self.field_tag
+        clone.len_param = self.len_param
+        clone._data = self._data
+        # sub classes without __slots__ of their own may set more attributes
+        attrs = getattr(self, "__dict__", None)
+        if attrs:
+            clone.__dict__.update(attrs)
+        return clone
+
     @property
-    def encoded(self) -> bytes:
+    def encoded(self) -> Optional[bytes]:
+        return self.encode_value(self.data)
+
+    def encode_value(self, data: Any) -> Optional[bytes]:
+        """Encode a value as this parameter, without setting it as its value."""
         return b""
 
     def extract_from_data(self, raw_data: bytes, pos: int, length: int = None) -> int:
@@ -371,8 +467,8 @@ class Param:
 
 class ListParam:
     """An individual PDU parameter definition that accepts lists as values."""
+    __slots__ = ("params", "len_param", "field_name", "data")
     params: Dict[str, Param]
-    has_optional_value = False
     is_optional = False
 
     def __init__(self, params_config: List[Tuple]):
@@ -394,148 +490,204 @@ class ListParam:
         self.field_name = None
         self.data = []
 
+    def copy(self) -> ListParam:
+        """Create a copy of the parameter, with an empty list as value."""
+        clone = object.__new__(self.__class__)
+        clone.params = {field_name: p.copy() for field_name, p in self.params.items()}
+        clone.len_param = self.len_param
+        clone.field_name = self.field_name
+        clone.data = []
+        attrs = getattr(self, "__dict__", None)
+        if attrs:
+            clone.__dict__.update(attrs)
+        return clone
+
     @property
     def encoded(self) -> bytes:
-        b = b""
-        for param in self.data:
-            for key, value in param.items():
-                param = self.params[key]
-                param.data = value
-                encoded_param = param.encoded
-                # TLVs are always optional
-                if param.is_optional and encoded_param:
-                    # print(f"adding {param.field_name} with value {encoded_param} (optional)")
-                    b += encoded_param
-                elif not param.is_optional:
-                    # ostr may not return data
-                    if param.has_optional_value and encoded_param:
-                        # print(f"adding {param.field_name} with value {encoded_param}")
-                        b += encoded_param
-                    else:
-                        # print(f"adding {param.field_name} with value {encoded_param}")
-                        b += encoded_param
-        return b
+        return self.encode_value(self.data)
+
+    def encode_value(self, data: List[dict]) -> bytes:
+        """Encode a list as this parameter, without setting it as its value."""
+        params = self.params
+        parts = []
+        for entry in data:
+            for key, value in entry.items():
+                encoded_param = params[key].encode_value(value)
+                # unset TLVs and octet strings do not return data
+                if encoded_param:
+                    parts.append(encoded_param)
+        return b"".join(parts)
 
     def extract_from_data(self, raw_data: bytes, pos: int, length: int = None) -> int:
         return pos
 
 
 class DestAddressList(ListParam):
+    __slots__ = ()
+
     def __init__(self, params_config):
         super().__init__(params_config)
         self.len_param = "number_of_dests"
 
     def extract_from_data(self, raw_data: bytes, pos: int, length: int = None) -> int:
+        params = self.params
+        # integers are unpacked directly, only the addresses go through their
+        # parameters
+        unpack_dest_flag = params["dest_flag"]._struct.unpack_from
+        unpack_ton = params["dest_addr_ton"]._struct.unpack_from
+        unpack_npi = params["dest_addr_npi"]._struct.unpack_from
+        flag_size = params["dest_flag"].size
+        ton_size = params["dest_addr_ton"].size
+        npi_size = params["dest_addr_npi"].size
+        destination_addr = params["destination_addr"]
+        dl_name = params["dl_name"]
+
         data = []
         for _ in range(length):
-            dest_flag = self.params["dest_flag"]
-            pos = dest_flag.extract_from_data(raw_data, pos)
-
-            if dest_flag.data == 1:
-                dest_addr_ton = self.params["dest_addr_ton"]
-                pos = dest_addr_ton.extract_from_data(raw_data, pos)
-                dest_addr_npi = self.params["dest_addr_npi"]
-                pos = dest_addr_npi.extract_from_data(raw_data, pos)
-                destination_addr = self.params["destination_addr"]
+            dest_flag, = unpack_dest_flag(raw_data, pos)
+            pos += flag_size
+
+            if dest_flag == 1:
+                dest_addr_ton, = unpack_ton(raw_data, pos)
+                pos += ton_size
+                dest_addr_npi, = unpack_npi(raw_data, pos)
+                pos += npi_size
                 pos = destination_addr.extract_from_data(raw_data, pos)
 
-                data.append({"dest_flag": dest_flag.data,
-                             "dest_addr_ton": dest_addr_ton.data,
-                             "dest_addr_npi": dest_addr_npi.data,
+                data.append({"dest_flag": dest_flag,
+                             "dest_addr_ton": dest_addr_ton,
+                             "dest_addr_npi": dest_addr_npi,
                              "destination_addr": destination_addr.data})
 
             else:
-                dl_name = self.params["dl_name"]
                 pos = dl_name.extract_from_data(raw_data, pos)
 
-                data.append({"dest_flag": dest_flag.data,
+                data.append({"dest_flag": dest_flag,
                              "dl_name": dl_name.data})
         self.data = data
         return pos
 
 
 class UnsuccessSmeList(ListParam):
+    __slots__ = ()
+
     def __init__(self, params_config):
         super().__init__(params_config)
         self.len_param = "no_unsuccess"
 
     def extract_from_data(self, raw_data: bytes, pos: int, length: int = None) -> int:
+        params = self.params
+        unpack_ton = params["dest_addr_ton"]._struct.unpack_from
+        unpack_npi = params["dest_addr_npi"]._struct.unpack_from
+        unpack_error = params["error_status_code"]._struct.unpack_from
+        ton_size = params["dest_addr_ton"].size
+        npi_size = params["dest_addr_npi"].size
+        error_size = params["error_status_code"].size
+        destination_addr = params["destination_addr"]
+
         data = []
         for _ in range(length):
-            dest_addr_ton = self.params["dest_addr_ton"]
-            pos = dest_addr_ton.extract_from_data(raw_data, pos)
-            dest_addr_npi = self.params["dest_addr_npi"]
-            pos = dest_addr_npi.extract_from_data(raw_data, pos)
-            destination_addr = self.params["destination_addr"]
+            dest_addr_ton, = unpack_ton(raw_data, pos)
+            pos += ton_size
+            dest_addr_npi, = unpack_npi(raw_data, pos)
+            pos += npi_size
             pos = destination_addr.extract_from_data(raw_data, pos)
-            error_status_code = self.params["error_status_code"]
-            pos = error_status_code.extract_from_data(raw_data, pos)
+            error_status_code, = unpack_error(raw_data, pos)
+            pos += error_size
 
-            data.append({"dest_addr_ton": dest_addr_ton.data,
-                         "dest_addr_npi": dest_addr_npi.data,
+            data.append({"dest_addr_ton": dest_addr_ton,
+                         "dest_addr_npi": dest_addr_npi,
                          "destination_addr": destination_addr.data,
-                         "error_status_code": error_status_code.data})
+                         "error_status_code": error_status_code})
 
         self.data = data
         return pos
 
 
 class IntegerParam(Param):
-    # int, short, long
-    pack_format = {1: "B", 2: "H", 4: "L"}
-
-    @property
-    def encoded(self) -> Optional[bytes]:
-        fmt = self.pack_format[self.size]
-        if self.data is None and not self.is_optional:
-            return b"\0"
-        elif self.data is None and self.is_optional:
-            return None
-        elif not self.is_optional:
-            return struct.pack(f">{fmt}", self.data)
-        else:
-            return struct.pack(f">HH{fmt}", self.field_tag, self.size, self.data)
+    __slots__ = ("_struct", "_tlv_struct")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # int, short, long; size never changes, so pick the structs only once
+        self._struct = _INT_STRUCTS.get(self.size)
+        self._tlv_struct = _INT_TLV_STRUCTS.get(self.size)
+
+    def copy(self) -> IntegerParam:
+        clone = super().copy()
+        clone._struct = self._struct
+        clone._tlv_struct = self._tlv_struct
+        return clone
+
+    def encode_value(self, data: Any) -> Optional[bytes]:
+        if data is None:
+            return None if self.is_optional else b"\0" * self.size
+        elif self.is_optional:
+            return self._tlv_struct.pack(self.field_tag, self.size, data)
+        return self._struct.pack(data)
 
     def extract_from_data(self, raw_data: bytes, pos: int, length: int = None) -> int:
         # unused for integers, always fixed size
         _ = length
 
-        fmt = self.pack_format[self.size]
-        self.data, = struct.unpack(f">{fmt}", raw_data[pos:pos + self.size])
+        self.data, = self._struct.unpack_from(raw_data, pos)
 
         return pos + self.size
 
 
 class StringParam(Param):
+    __slots__ = ("_raw",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # parsed value that has not been decoded yet
+        self._raw = None
+
     @property
-    def encoded(self) -> Optional[bytes]:
+    def data(self):
+        if self._raw is not None:
+            self._data = self._raw.decode()
+            self._raw = None
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._raw = None
+        self._data = value
+
+    def copy(self) -> StringParam:
+        clone = super().copy()
+        clone._raw = self._raw
+        return clone
+
+    def encode_value(self, data: Any) -> Optional[bytes]:
         if self.size is not None:
-            value = self.data.ljust(self.size, chr(0))
-            if not isinstance(value, bytes):
-                value = value.encode("latin-1")
+            if not isinstance(data, bytes):
+                data = data.encode("latin-1")
+            value = data.ljust(self.size, b"\0")
             if not self.is_optional:
                 return value
 
-            return struct.pack(">HH", self.field_tag, self.size) + value
+            return _TLV_HEADER.pack(self.field_tag, self.size) + value
 
         elif self.max_len is not None:
-            if self.data is None and not self.is_optional:
+            if data is None and not self.is_optional:
                 # non tlv and empty - always return at least NULL
-                value = chr(0)
-            elif self.data is None and self.is_optional:
+                value = b"\0"
+            elif data is None and self.is_optional:
                 # tlv and empty, just abort
                 return None
-            elif len(self.data) > self.max_len:
-                value = self.data[0:self.max_len - 1] + chr(0)
             else:
-                value = self.data + chr(0)
-
-            value = value.encode("latin-1")
+                if len(data) > self.max_len:
+                    data = data[0:self.max_len - 1]
+                if not isinstance(data, bytes):
+                    data = data.encode("latin-1")
+                value = data + b"\0"
 
             if not self.is_optional:
                 return value
 
-            return struct.pack(">HH", self.field_tag, len(value)) + value
+            return _TLV_HEADER.pack(self.field_tag, len(value)) + value
 
         else:
             raise PduParseError(f"Misconfigured parameter {self.field_name}, "
@@ -544,28 +696,43 @@ class StringParam(Param):
 
     def extract_from_data(self, raw_data: bytes, pos: int, length: int = None) -> int:
         if length is None:
-            end_pos = raw_data.find(b"\0", pos)
+            try:
+                end_pos = raw_data.index(b"\0", pos)
+            except ValueError:
+                raise PduParseError(f"Value of {self.field_name} is not null "
+                                    f"terminated")
             length = end_pos - pos + 1  # extracting including the \0
 
-        self.data = raw_data[pos:pos + length - 1].decode()  # set data without trailing \0
+        # data without trailing \0; ASCII always decodes, so it is decoded only
+        # when first accessed, anything else is checked while parsing
+        raw = raw_data[pos:pos + length - 1]
+        if raw.isascii():
+            self._raw = raw
+            self._data = None
+        else:
+            try:
+                self._data = raw.decode()
+            except UnicodeDecodeError as e:
+                raise PduParseError(f"Value of {self.field_name} is not valid "
+                                    f"UTF-8: {e}")
+            self._raw = None
         return pos + length
 
 
 class OctetStringParam(Param):
-    has_optional_value = True
+    __slots__ = ()
 
-    @property
-    def encoded(self) -> Optional[bytes]:
-        if self.data is None:
+    def encode_value(self, data: Any) -> Optional[bytes]:
+        if data is None:
             return None
 
-        value = self.data
+        value = data
         if not isinstance(value, bytes):
             raise PduParseError(f"Value of {self.field_name} must be in bytes")
         if not self.is_optional:
             return value
 
-        return struct.pack(">HH", self.field_tag, len(value)) + value
+        return _TLV_HEADER.pack(self.field_tag, len(value)) + value
 
     def extract_from_data(self, raw_data: bytes, pos: int, length: int = None) -> int:
         if length is None:
@@ -577,6 +744,7 @@ class OctetStringParam(Param):
 
 
 class AlertNotification(PDU):
+    command_id = constants.CMD_ALERT_NOTIFICATION
     need_sequence = True
 
     params_config = [
@@ -590,6 +758,8 @@ class AlertNotification(PDU):
 
 
 class BindTransmitter(PDU):
+    command_id = constants.CMD_BIND_TRANSMITTER
+
     params_config = [
         ("system_id", StringParam, {"max_len": 16}),
         ("password", StringParam, {"max_len": 9}),
@@ -601,28 +771,31 @@ class BindTransmitter(PDU):
 
 
 class BindTransmitterResp(PDU):
+    command_id = constants.CMD_BIND_TRANSMITTER_RESP
+
     params_config = [
         ("system_id", StringParam, {"max_len": 16}),
         ("sc_interface_version", IntegerParam, {"size": 1})]
 
 
 class BindReceiver(BindTransmitter):
-    pass
+    command_id = constants.CMD_BIND_RECEIVER
 
 
 class BindReceiverResp(BindTransmitterResp):
-    pass
+    command_id = constants.CMD_BIND_RECEIVER_RESP
 
 
 class BindTransceiver(BindTransmitter):
-    pass
+    command_id = constants.CMD_BIND_TRANSCEIVER
 
 
 class BindTransceiverResp(BindTransmitterResp):
-    pass
+    command_id = constants.CMD_BIND_TRANSCEIVER_RESP
 
 
 class CancelSm(PDU):
+    command_id = constants.CMD_CANCEL_SM
     need_sequence = True
 
     params_config = [
@@ -637,10 +810,12 @@ class CancelSm(PDU):
 
 
 class CancelSmResp(PDU):
+    command_id = constants.CMD_CANCEL_SM_RESP
     params_config = []
 
 
 class DataSm(PDU):
+    command_id = constants.CMD_DATA_SM
     need_sequence = True
 
     params_config = [
@@ -694,6 +869,8 @@ class DataSm(PDU):
 
 
 class DataSmResp(PDU):
+    command_id = constants.CMD_DATA_SM_RESP
+
     params_config = [
         ("message_id", StringParam, {"max_len": 65}),
         ("delivery_failure_reason", IntegerParam, {"size": 1}),
@@ -703,6 +880,7 @@ class DataSmResp(PDU):
 
 
 class DeliverSm(PDU):
+    command_id = constants.CMD_DELIVER_SM
     need_sequence = True
 
     params_config = [
@@ -748,34 +926,39 @@ class DeliverSm(PDU):
         ("more_messages_to_send", IntegerParam, {"size": 1})]
 
     def _prepare_body(self):
-        if self.short_message:
-            if self.message_payload is not None:
-                raise PduParseError("message_payload and short_message cannot "
-                                    "coexist")
-            self.sm_length = len(self.short_message)
-        else:
-            self.sm_length = 0
+        params = self.params
+        short_message = params["short_message"].data
+        if short_message and params["message_payload"].data is not None:
+            raise PduParseError("message_payload and short_message cannot "
+                                "coexist")
+        self._set_lengths(params, {"short_message": short_message})
 
 
 class DeliverSmResp(PDU):
+    command_id = constants.CMD_DELIVER_SM_RESP
+
     params_config = [
         ("message_id", StringParam, {"max_len": 65})]
 
 
 class EnquireLink(PDU):
+    command_id = constants.CMD_ENQUIRE_LINK
     need_sequence = True
     params_config = []
 
 
 class EnquireLinkResp(PDU):
+    command_id = constants.CMD_ENQUIRE_LINK_RESP
     params_config = []
 
 
 class GenericNack(PDU):
+    command_id = constants.CMD_GENERIC_NACK
     params_config = []
 
 
 class QuerySm(PDU):
+    command_id = constants.CMD_QUERY_SM
     need_sequence = True
 
     params_config = [
@@ -786,6 +969,8 @@ class QuerySm(PDU):
 
 
 class QuerySmResp(PDU):
+    command_id = constants.CMD_QUERY_SM_RESP
+
     params_config = [
         ("message_id", StringParam, {"max_len": 65}),
         ("final_date", StringParam, {"max_len": 17}),
@@ -795,6 +980,7 @@ class QuerySmResp(PDU):
 
 
 class ReplaceSm(PDU):
+    command_id = constants.CMD_REPLACE_SM
     need_sequence = True
 
     params_config = [
@@ -809,17 +995,14 @@ class ReplaceSm(PDU):
         ("sm_length", IntegerParam, {"size": 1}),
         ("short_message", OctetStringParam, {"max_len": 254, "len_param": "sm_length"})]
 
-    def _prepare_body(self):
-        self.sm_length = 0
-        if self.short_message:
-            self.sm_length = len(self.short_message)
-
 
 class ReplaceSmResp(PDU):
+    command_id = constants.CMD_REPLACE_SM_RESP
     params_config = []
 
 
 class SubmitMulti(PDU):
+    command_id = constants.CMD_SUBMIT_MULTI
     need_sequence = True
 
     params_config = [
@@ -873,18 +1056,17 @@ class SubmitMulti(PDU):
         ("language_indicator", IntegerParam, {"size": 1})]
 
     def _prepare_body(self):
-        if self.short_message:
-            if self.message_payload is not None:
-                raise PduParseError("message_payload and short_message cannot "
-                                    "coexist")
-            self.sm_length = len(self.short_message)
-        else:
-            self.sm_length = 0
-
-        self.number_of_dests = len(self.dest_address)
+        params = self.params
+        short_message = params["short_message"].data
+        if short_message and params["message_payload"].data is not None:
+            raise PduParseError("message_payload and short_message cannot "
+                                "coexist")
+        self._set_lengths(params, {"short_message": short_message})
 
 
 class SubmitMultiResp(PDU):
+    command_id = constants.CMD_SUBMIT_MULTI_RESP
+
     params_config = [
         ("message_id", StringParam, {"max_len": 65}),
         ("no_unsuccess", IntegerParam, {"size": 1}),
@@ -897,6 +1079,7 @@ class SubmitMultiResp(PDU):
 
 
 class SubmitSm(PDU):
+    command_id = constants.CMD_SUBMIT_SM
     need_sequence = True
 
     params_config = [
@@ -948,29 +1131,62 @@ class SubmitSm(PDU):
         ("ussd_service_op", IntegerParam, {"size": 1})]
 
     def _prepare_body(self):
-        if self.short_message:
-            if self.message_payload is not None:
-                raise PduParseError("message_payload and short_message cannot "
-                                    "coexist")
-            self.sm_length = len(self.short_message)
-        else:
-            self.sm_length = 0
+        params = self.params
+        short_message = params["short_message"].data
+        if short_message and params["message_payload"].data is not None:
+            raise PduParseError("message_payload and short_message cannot "
+                                "coexist")
+        self._set_lengths(params, {"short_message": short_message})
 
 
 class SubmitSmResp(PDU):
+    command_id = constants.CMD_SUBMIT_SM_RESP
+
     params_config = [
         ("message_id", StringParam, {"max_len": 65})]
 
 
 class Unbind(PDU):
+    command_id = constants.CMD_UNBIND
     need_sequence = True
     params_config = []
 
 
 class UnbindResp(PDU):
+    command_id = constants.CMD_UNBIND_RESP
     params_config = []
 
 
+# command ID -> PDU class, for `PDU.new`
+_COMMAND_CLASSES = {
+    constants.CMD_ALERT_NOTIFICATION: AlertNotification,
+    constants.CMD_BIND_RECEIVER: BindReceiver,
+    constants.CMD_BIND_RECEIVER_RESP: BindReceiverResp,
+    constants.CMD_BIND_TRANSCEIVER: BindTransceiver,
+    constants.CMD_BIND_TRANSCEIVER_RESP: BindTransceiverResp,
+    constants.CMD_BIND_TRANSMITTER: BindTransmitter,
+    constants.CMD_BIND_TRANSMITTER_RESP: BindTransmitterResp,
+    constants.CMD_CANCEL_SM: CancelSm,
+    constants.CMD_CANCEL_SM_RESP: CancelSmResp,
+    constants.CMD_DATA_SM: DataSm,
+    constants.CMD_DATA_SM_RESP: DataSmResp,
+    constants.CMD_DELIVER_SM: DeliverSm,
+    constants.CMD_DELIVER_SM_RESP: DeliverSmResp,
+    constants.CMD_ENQUIRE_LINK: EnquireLink,
+    constants.CMD_ENQUIRE_LINK_RESP: EnquireLinkResp,
+    constants.CMD_GENERIC_NACK: GenericNack,
+    constants.CMD_QUERY_SM: QuerySm,
+    constants.CMD_QUERY_SM_RESP: QuerySmResp,
+    constants.CMD_REPLACE_SM: ReplaceSm,
+    constants.CMD_REPLACE_SM_RESP: ReplaceSmResp,
+    constants.CMD_SUBMIT_MULTI: SubmitMulti,
+    constants.CMD_SUBMIT_MULTI_RESP: SubmitMultiResp,
+    constants.CMD_SUBMIT_SM: SubmitSm,
+    constants.CMD_SUBMIT_SM_RESP: SubmitSmResp,
+    constants.CMD_UNBIND: Unbind,
+    constants.CMD_UNBIND_RESP: UnbindResp}
+
+
 def define_optional_param(cmd: Type[PDU], param_type: Type[Param], tag: int,
                           tag_name: str, size: int = None, min_len: int = None,
                           max_len: int = None, len_param: str = None,
@@ -1013,14 +1229,21 @@ def define_optional_param(cmd: Type[PDU], param_type: Type[Param], tag: int,
     """
     if tag_name not in OPTIONAL_PARAM_TAGS:
         OPTIONAL_PARAM_TAGS[tag_name] = tag
+        OPTIONAL_PARAM_TAG_NAMES.setdefault(tag, tag_name)
 
-    for param_name, _, _ in cmd.params_config:
-        if param_name == tag_name:
-            logger.warning(f"ignoring an already defined parameter definition "
-                           f"for tag {tag_name}")
-            return
+    if tag_name in cmd._param_prototypes:
+        logger.warning(f"ignoring an already defined parameter definition "
+                       f"for tag {tag_name}")
+        return
 
-    cmd.params_config.append((
+    cmd.params_config = (*cmd.params_config, (
         tag_name, param_type, {
             "size": size, "min_len": min_len, "max_len": max_len,
             "len_param": len_param, "initial": initial}))
+
+    # sub classes without a parameter config of their own inherit the new one
+    classes = [cmd]
+    while classes:
+        cls = classes.pop()
+        cls._build_param_prototypes()
+        classes.extend(cls.__subclasses__())
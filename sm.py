@@ -7,6 +7,20 @@ from typing import List, Tuple, Union
 from . import constants
 from .encoding import gsm0338
 
+# data codings that `encode_short_message` can encode text in -> codec name
+DATA_CODING_CODECS = {
+    constants.DATA_CODING_DEFAULT: "gsm0338",
+    constants.DATA_CODING_ISO88591: "iso-8859-1",
+    constants.DATA_CODING_ISO88595: "iso-8859-5",
+    constants.DATA_CODING_ISO88598: "iso-8859-8",
+    constants.DATA_CODING_ISO10646: "utf-16-be"}
+
+BINARY_DATA_CODINGS = (constants.DATA_CODING_BINARY, constants.DATA_CODING_BINARY2)
+
+# every character that has a GSM 03.38 encoding, escaped ones included
+_GSM_CHARS = frozenset(gsm0338.CHARS_UNICODE_TO_GSM).union(
+    gsm0338.ESCAPED_CHARS_UNICODE_TO_GSM)
+
 
 def encode_short_message(short_message: Union[str, bytes],
                          encoding: int = constants.DATA_CODING_DEFAULT) -> Tuple[bytes, int]:
@@ -29,32 +43,25 @@ def encode_short_message(short_message: Union[str, bytes],
     if isinstance(short_message, bytes):
         return short_message, encoding
 
-    encoded = False
+    if encoding in BINARY_DATA_CODINGS:
+        raise ValueError("Binary data coding requires bytes input")
+
+    codec = DATA_CODING_CODECS.get(encoding)
+    if codec is None:
+        raise ValueError(f"Unhandled encoding {hex(encoding)}")
+
+    # non-ASCII text is often not GSM 03.38 either (emoji, non-latin scripts),
+    # check for that without taking the round trip through UnicodeError
+    if (encoding == constants.DATA_CODING_DEFAULT and
+            not short_message.isascii() and
+            not _GSM_CHARS.issuperset(short_message)):
+        return short_message.encode("utf-16-be"), constants.DATA_CODING_ISO10646
+
     try:
-        if encoding == constants.DATA_CODING_DEFAULT:
-            data = short_message.encode("gsm0338")
-        elif encoding == constants.DATA_CODING_ISO88591:
-            data = short_message.encode("iso-8859-1")
-        elif encoding == constants.DATA_CODING_ISO88595:
-            data = short_message.encode("iso-8859-5")
-        elif encoding == constants.DATA_CODING_ISO88598:
-            data = short_message.encode("iso-8859-8")
-
-        encoded = True
+        return short_message.encode(codec), encoding
     except UnicodeError:
         # falling back on UCS2
-        encoding = constants.DATA_CODING_ISO10646
-
-    if encoding == constants.DATA_CODING_ISO10646:
-        data = short_message.encode("utf-16-be")
-    elif encoding in (constants.DATA_CODING_BINARY, constants.DATA_CODING_BINARY2):
-        if not isinstance(data, bytes):
-            raise ValueError("Binary data coding requires bytes input")
-        data = short_message
-    elif not encoded:
-        raise ValueError(f"Unhandled encoding {hex(encoding)}")
-
-    return data, encoding
+        return short_message.encode("utf-16-be"), constants.DATA_CODING_ISO10646
 
 
 def split_short_message(data: Union[str, bytes],
@@ -87,7 +94,7 @@ def split_short_message(data: Union[str, bytes],
     if encoding == constants.DATA_CODING_DEFAULT:
         max_len = 160
         chunk_size = 153
-    elif encoding in (constants.DATA_CODING_BINARY, constants.DATA_CODING_BINARY2):
+    elif encoding in BINARY_DATA_CODINGS:
         max_len = 70
         chunk_size = 67
     else:
@@ -98,10 +105,9 @@ def split_short_message(data: Union[str, bytes],
         esm_class = 0x40
 
         chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
-        uid = random.randint(0, 255).to_bytes(1, "big")
-        udh = b"\x05\x00\x03" + uid + len(chunks).to_bytes(1, "big")
+        udh = bytes((0x05, 0x00, 0x03, random.getrandbits(8), len(chunks)))
 
-        parts = [b"".join((udh, count.to_bytes(1, "big"), chunk))
+        parts = [b"".join((udh, bytes((count,)), chunk))
                  for count, chunk in enumerate(chunks, start=1)]
 
         return esm_class, encoding, parts
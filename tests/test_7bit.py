@@ -0,0 +1,28 @@
+"""
+Run from parent directory:
+~# python3 -m pytest -W ignore::UserWarning -W ignore::DeprecationWarning -vv smpp/
+"""
+import pytest
+
+from smpp import pack_7bit, unpack_7bit
+
+
+def test_pack_7bit():
+    assert pack_7bit(b"7bit").hex() == "37719a0e"
+
+
+def test_pack_7bit_padding():
+    assert pack_7bit(b"7bit", padding=1).hex() == "6ee2341d"
+
+
+def test_unpack_7bit():
+    assert unpack_7bit(bytes.fromhex("37719a0e")) == b"7bit"
+
+
+def test_unpack_7bit_padding():
+    assert unpack_7bit(bytes.fromhex("6ee2341d"), padding=1) == b"7bit"
+
+
+def test_7bit_in_out():
+    data = b"Pack this into 7bit!"
+    assert unpack_7bit(pack_7bit(data)) == data
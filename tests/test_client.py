@@ -0,0 +1,209 @@
+"""
+Run from parent directory:
+~# python3 -m pytest -W ignore::UserWarning -W ignore::DeprecationWarning -vv smpp/
+"""
+import pytest
+
+import socket
+import threading
+import time
+
+from smpp import client, constants, pdu, PduParseError, SmppConnectionError
+
+
+@pytest.fixture
+def esme():
+    local, remote = socket.socketpair()
+    local.settimeout(2)
+
+    esme = client.Client("localhost", 2776)
+    esme._socket.close()
+    esme._socket = local
+    esme.state = constants.SESSION_STATE_BOUND_TRX
+
+    yield esme, remote
+
+    remote.close()
+    if esme._socket is not None:
+        esme._socket.close()
+        esme._socket = None
+
+
+def test_read_pdu_short_reads(esme):
+    esme, remote = esme
+    p = pdu.PDU.new(constants.CMD_DELIVER_SM,
+                    sequence_number=7,
+                    source_addr="4178481581",
+                    short_message=b"x" * 200)
+    raw_pdu = p.header + p.body
+
+    def send_in_pieces():
+        for i in range(0, len(raw_pdu), 13):
+            remote.send(raw_pdu[i:i + 13])
+            time.sleep(0.001)
+
+    sender = threading.Thread(target=send_in_pieces)
+    sender.start()
+    result, _ = esme._read_pdu()
+    sender.join()
+
+    assert result.sequence_number == 7
+    assert result.source_addr == "4178481581"
+    assert result.short_message == b"x" * 200
+
+
+def test_read_pdu_broken_socket(esme):
+    esme, remote = esme
+    remote.sendall(b"\x00\x00")
+    remote.close()
+
+    with pytest.raises(SmppConnectionError):
+        esme._read_pdu()
+
+
+def test_read_pdu_invalid_length(esme):
+    esme, remote = esme
+    p = pdu.PDU.new(constants.CMD_SUBMIT_SM_RESP,
+                    sequence_number=17,
+                    message_id="valid")
+    remote.sendall(b"\x00\x00\x00\x05" + p.header + p.body)
+
+    with pytest.raises(PduParseError):
+        esme._read_pdu()
+
+    result, _ = esme._read_pdu()
+    assert result.sequence_number == 17
+    assert result.message_id == "valid"
+
+
+def test_read_one_pdu_deliver_sm(esme):
+    esme, remote = esme
+    esme.set_callbacks(deliver_sm=lambda p: constants.ESME_RX_T_APPN)
+    p = pdu.PDU.new(constants.CMD_DELIVER_SM, sequence_number=12,
+                    short_message=b"delivered")
+    remote.sendall(p.header + p.body)
+
+    assert esme.read_one_pdu() is True
+
+    response = pdu.PDU.new_from_raw(remote.recv(1024))
+    assert response.command_id == constants.CMD_DELIVER_SM_RESP
+    assert response.command_status == constants.ESME_RX_T_APPN
+    assert response.sequence_number == 12
+
+
+def test_read_one_pdu_unbind(esme):
+    esme, remote = esme
+    p = pdu.PDU.new(constants.CMD_UNBIND, sequence_number=13)
+    remote.sendall(p.header + p.body)
+
+    assert esme.read_one_pdu() is False
+
+    response = pdu.PDU.new_from_raw(remote.recv(1024))
+    assert response.command_id == constants.CMD_UNBIND_RESP
+    assert response.sequence_number == 13
+
+
+def test_send_response_template(esme):
+    esme, remote = esme
+    esme._send_response(constants.CMD_DELIVER_SM_RESP, constants.ESME_RSYSERR, 14)
+
+    p = pdu.PDU.new(constants.CMD_DELIVER_SM_RESP,
+                    command_status=constants.ESME_RSYSERR,
+                    sequence_number=14)
+    assert remote.recv(1024) == p.header + p.body
+
+
+def test_send_response_callback(esme):
+    esme, remote = esme
+    sent = []
+    esme.set_callbacks(enquire_link_resp=sent.append)
+    esme._send_response(constants.CMD_ENQUIRE_LINK_RESP, constants.ESME_ROK, 15)
+
+    assert len(sent) == 1
+    assert sent[0].sequence_number == 15
+    assert remote.recv(1024) == sent[0].header + sent[0].body
+
+
+def test_read_pdu_burst(esme):
+    esme, remote = esme
+    # small buffer, so that unparsed data has to be moved and the buffer grown
+    esme._recv_buffer = bytearray(40)
+    esme._recv_view = memoryview(esme._recv_buffer)
+
+    sent = [pdu.PDU.new(constants.CMD_SUBMIT_SM_RESP,
+                        sequence_number=seq,
+                        message_id=f"msg{seq}" * seq)
+            for seq in range(1, 6)]
+    remote.sendall(b"".join(p.header + p.body for p in sent))
+
+    for p in sent:
+        result, _ = esme._read_pdu()
+        assert result.sequence_number == p.sequence_number
+        assert result.message_id == p.message_id
+
+    assert esme._recv_start == esme._recv_end == 0
+
+
+def test_read_pdu_oversized(esme, monkeypatch):
+    esme, remote = esme
+    monkeypatch.setattr(client, "RECV_BUFFER_SIZE", 100)
+    esme._recv_buffer = bytearray(100)
+    esme._recv_view = memoryview(esme._recv_buffer)
+
+    p = pdu.PDU.new(constants.CMD_DELIVER_SM,
+                    sequence_number=19,
+                    short_message=b"x" * 200)
+    remote.sendall(p.header + p.body)
+
+    result, _ = esme._read_pdu()
+    assert result.short_message == b"x" * 200
+    # the grown buffer is dropped once the PDU has been consumed
+    assert len(esme._recv_buffer) == 100
+
+
+def test_read_pdu_timeout_resume(esme):
+    esme, remote = esme
+    esme._socket.settimeout(0.05)
+    p = pdu.PDU.new(constants.CMD_SUBMIT_SM_RESP,
+                    sequence_number=16,
+                    message_id="resumed")
+    raw_pdu = p.header + p.body
+
+    remote.sendall(raw_pdu[:10])
+    with pytest.raises(socket.timeout):
+        esme._read_pdu()
+
+    remote.sendall(raw_pdu[10:])
+    result, _ = esme._read_pdu()
+    assert result.sequence_number == 16
+    assert result.message_id == "resumed"
+
+
+def test_submit_sm_batch(esme):
+    esme, remote = esme
+    sent = []
+    esme.set_callbacks(submit_sm=sent.append)
+    destinations = ["4178481581", "4178481582", "41784815830"]
+
+    sequences = esme.submit_sm_batch(destinations, source_addr="sender",
+                                     short_message=b"batch")
+
+    assert [p.destination_addr for p in sent] == destinations
+    assert [p.sequence_number for p in sent] == sequences
+    assert len(set(sequences)) == len(destinations)
+    for destination_addr, sequence in zip(destinations, sequences):
+        p = pdu.PDU.new(constants.CMD_SUBMIT_SM,
+                        sequence_number=sequence,
+                        source_addr="sender",
+                        destination_addr=destination_addr,
+                        short_message=b"batch")
+        raw_pdu = p.header + p.body
+        assert remote.recv(len(raw_pdu), socket.MSG_WAITALL) == raw_pdu
+
+
+def test_submit_sm_batch_per_destination_params(esme):
+    esme, remote = esme
+
+    with pytest.raises(ValueError):
+        esme.submit_sm_batch(["4178481581"], sequence_number=18,
+                             short_message=b"batch")
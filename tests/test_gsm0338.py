@@ -19,6 +19,19 @@ def test_encode_escaped():
     assert "{ brackets text }".encode("gsm0338") == b"\x1b( brackets text \x1b)"
 
 
+def test_encode_invalid_strict():
+    with pytest.raises(UnicodeError):
+        "text ` with 可".encode("gsm0338")
+
+
+def test_encode_invalid_replace():
+    assert "Ωμέγα ` 可".encode("gsm0338", "replace") == b"\x15???? ? ?"
+
+
+def test_encode_invalid_ignore():
+    assert "Ωμέγα ` 可".encode("gsm0338", "ignore") == b"\x15  "
+
+
 def test_decode_alphanumeric():
     assert b"Abc1234".decode("gsm0338") == "Abc1234"
 
@@ -29,3 +42,16 @@ def test_decode_special_chars():
 
 def test_decode_escaped():
     assert b"\x1b( brackets text \x1b)".decode("gsm0338") == "{ brackets text }"
+
+
+def test_decode_invalid_strict():
+    with pytest.raises(UnicodeError):
+        b"text \x80 data".decode("gsm0338")
+
+
+def test_decode_invalid_replace():
+    assert b"text \x80 \x1b\xff".decode("gsm0338", "replace") == "text ? \xa0"
+
+
+def test_decode_invalid_ignore():
+    assert b"text \x80 data\x1b".decode("gsm0338", "ignore") == "text  data\xa0"
@@ -4,15 +4,60 @@ Run from parent directory:
 """
 import pytest
 
-import os
 import random
 import string
 
 from smpp import constants, pdu, PduParseError
 
+# submit_sm with a message_payload TLV
+RAW_SUBMIT_SM = bytes.fromhex(
+    "0000019800000004000000000000587b000500497073756d496e666f00010134313731"
+    "37353130323033320003000000001100f100000424015e4c6f72656d20697073756d20"
+    "646f6c6f722073697420616d65742c20636f6e73656374657475722061646970697363"
+    "696e6720656c69742e205072616573656e74207669746165206e657175652062696265"
+    "6e64756d206f72636920636f6e67756520766573746962756c756d2e20446f6e656320"
+    "76697461652074696e636964756e742072697375732e204d617572697320657520636f"
+    "6e677565206573742e2053757370656e64697373652072686f6e637573206469616d20"
+    "72697375732e20496e2073656d7065722073656d207175697320636f6e64696d656e74"
+    "756d2072686f6e6375732e20496e2076656c2075726e612072697375732e204e616d20"
+    "75742070757275732073697420616d6574206c696265726f206c6163696e696120736f"
+    "6c6c696369747564696e2e20446f6e6563207072657469756d206f726e617265206475"
+    "6920696e206d616c65737561646120706f73756572652e")
+
+# data_sm that contains a TLV with tag value 0x1401 at the end and two bytes
+# of unknown data
+RAW_DATA_SM_VENDOR_TLV = bytes.fromhex(
+    "000001ac00000103000000000000587b000500497073756d496e666f00010134313731"
+    "37353130323033320000000000190001010424015e4c6f72656d20697073756d20646f"
+    "6c6f722073697420616d65742c20636f6e73656374657475722061646970697363696e"
+    "6720656c69742e205072616573656e74207669746165206e6571756520626962656e64"
+    "756d206f72636920636f6e67756520766573746962756c756d2e20446f6e6563207669"
+    "7461652074696e636964756e742072697375732e204d617572697320657520636f6e67"
+    "7565206573742e2053757370656e64697373652072686f6e637573206469616d207269"
+    "7375732e20496e2073656d7065722073656d207175697320636f6e64696d656e74756d"
+    "2072686f6e6375732e20496e2076656c2075726e612072697375732e204e616d207574"
+    "2070757275732073697420616d6574206c696265726f206c6163696e696120736f6c6c"
+    "696369747564696e2e20446f6e6563207072657469756d206f726e6172652064756920"
+    "696e206d616c65737561646120706f73756572652e0381000c34313731373531303230"
+    "333214010002f4e0")
+
+SUBMIT_MULTI_DEST_ADDRESS = [
+    {"dest_flag": 1, "dest_addr_ton": 1, "dest_addr_npi": 1, "destination_addr": "4178481581"},
+    {"dest_flag": 1, "dest_addr_ton": 1, "dest_addr_npi": 1, "destination_addr": "4178481582"},
+    {"dest_flag": 2, "dl_name": "distlist"},
+    {"dest_flag": 1, "dest_addr_ton": 1, "dest_addr_npi": 1, "destination_addr": "4178481583"}
+]
+
+SUBMIT_MULTI_RESP_UNSUCCESS_SME = [
+    {"dest_addr_ton": 1, "dest_addr_npi": 1, "destination_addr": "4178481581", "error_status_code": 4},
+    {"dest_addr_ton": 1, "dest_addr_npi": 1, "destination_addr": "4178481582", "error_status_code": 5}
+]
+
+STR_ALPHABET = string.ascii_lowercase + string.digits
+
 
 def _gen_bytes(size):
-    return os.urandom(size)
+    return random.getrandbits(8 * size).to_bytes(size, "little")
 
 
 def _gen_int(size):
@@ -20,8 +65,7 @@ def _gen_int(size):
 
 
 def _gen_str(size):
-    return "".join(random.choice(string.ascii_lowercase + string.digits)
-                   for _ in range(size))
+    return "".join(random.choices(STR_ALPHABET, k=size))
 
 
 def _field_value(field_type, field_params):
@@ -41,29 +85,36 @@ def _field_value(field_type, field_params):
     return value
 
 
-def test_pdu_new():
-    p = pdu.PDU.new(constants.CMD_BIND_TRANSCEIVER,
-                    system_id="pytest",
-                    password="secret")
+# random values for all parameters of a command, except the ones in `skip`,
+# or the ones given in `values`
+def _random_args(cmd_class, skip=(), **values):
+    pdu_args = {}
+    for field_name, field_type, field_params in cmd_class.params_config:
+        if field_name in values:
+            pdu_args[field_name] = values[field_name]
+        elif field_name not in skip:
+            pdu_args[field_name] = _field_value(field_type, field_params)
+    return pdu_args
 
-    assert p.system_id == "pytest"
-    assert p.password == "secret"
 
+@pytest.fixture(scope="module")
+def bind_transceiver():
+    return pdu.PDU.new(constants.CMD_BIND_TRANSCEIVER,
+                       system_id="demofoo",
+                       password="secret!")
 
-def test_pdu_header():
-    p = pdu.PDU.new(constants.CMD_BIND_TRANSCEIVER,
-                    system_id="demofoo",
-                    password="secret!")
 
-    assert p.header == b"\x00\x00\x00%\x00\x00\x00\t\x00\x00\x00\x00\x00\x00\x00\x00"
+def test_pdu_new(bind_transceiver):
+    assert bind_transceiver.system_id == "demofoo"
+    assert bind_transceiver.password == "secret!"
 
 
-def test_pdu_body():
-    p = pdu.PDU.new(constants.CMD_BIND_TRANSCEIVER,
-                    system_id="demofoo",
-                    password="secret!")
+def test_pdu_header(bind_transceiver):
+    assert bind_transceiver.header == b"\x00\x00\x00%\x00\x00\x00\t\x00\x00\x00\x00\x00\x00\x00\x00"
 
-    assert p.body == b"demofoo\x00secret!\x00\x004\x00\x00\x00"
+
+def test_pdu_body(bind_transceiver):
+    assert bind_transceiver.body == b"demofoo\x00secret!\x00\x004\x00\x00\x00"
 
 
 def test_pdu_in_out():
@@ -103,21 +154,7 @@ def test_pdu_optional_params():
 
 
 def test_parse_pdu():
-    raw_pdu = bytes.fromhex(
-        "0000019800000004000000000000587b000500497073756d496e666f00010134313731"
-        "37353130323033320003000000001100f100000424015e4c6f72656d20697073756d20"
-        "646f6c6f722073697420616d65742c20636f6e73656374657475722061646970697363"
-        "696e6720656c69742e205072616573656e74207669746165206e657175652062696265"
-        "6e64756d206f72636920636f6e67756520766573746962756c756d2e20446f6e656320"
-        "76697461652074696e636964756e742072697375732e204d617572697320657520636f"
-        "6e677565206573742e2053757370656e64697373652072686f6e637573206469616d20"
-        "72697375732e20496e2073656d7065722073656d207175697320636f6e64696d656e74"
-        "756d2072686f6e6375732e20496e2076656c2075726e612072697375732e204e616d20"
-        "75742070757275732073697420616d6574206c696265726f206c6163696e696120736f"
-        "6c6c696369747564696e2e20446f6e6563207072657469756d206f726e617265206475"
-        "6920696e206d616c65737561646120706f73756572652e")
-
-    p = pdu.PDU.new_from_raw(raw_pdu)
+    p = pdu.PDU.new_from_raw(RAW_SUBMIT_SM)
     assert p.sequence_number == 22651
     assert p.source_addr_ton == 5
     assert p.source_addr == "IpsumInfo"
@@ -126,24 +163,7 @@ def test_parse_pdu():
 
 
 def test_parse_pdu_unknown_tlv():
-    # this data contains a TLV with tag value 0x1401 at the end and two bytes
-    # of unknown data
-    raw_pdu = bytes.fromhex(
-        "000001ac00000103000000000000587b000500497073756d496e666f00010134313731"
-        "37353130323033320000000000190001010424015e4c6f72656d20697073756d20646f"
-        "6c6f722073697420616d65742c20636f6e73656374657475722061646970697363696e"
-        "6720656c69742e205072616573656e74207669746165206e6571756520626962656e64"
-        "756d206f72636920636f6e67756520766573746962756c756d2e20446f6e6563207669"
-        "7461652074696e636964756e742072697375732e204d617572697320657520636f6e67"
-        "7565206573742e2053757370656e64697373652072686f6e637573206469616d207269"
-        "7375732e20496e2073656d7065722073656d207175697320636f6e64696d656e74756d"
-        "2072686f6e6375732e20496e2076656c2075726e612072697375732e204e616d207574"
-        "2070757275732073697420616d6574206c696265726f206c6163696e696120736f6c6c"
-        "696369747564696e2e20446f6e6563207072657469756d206f726e6172652064756920"
-        "696e206d616c65737561646120706f73756572652e0381000c34313731373531303230"
-        "333214010002f4e0")
-
-    p = pdu.PDU.new_from_raw(raw_pdu)
+    p = pdu.PDU.new_from_raw(RAW_DATA_SM_VENDOR_TLV)
     assert p.sequence_number == 22651
     assert p.payload_type == 0x01
 
@@ -152,261 +172,205 @@ def test_parse_pdu_custom_tlv():
     pdu.define_optional_param(pdu.DataSm, pdu.OctetStringParam, 0x1401,
                               "vendor_tag", size=2)
 
-    # this data contains a TLV with tag value 0x1401 at the end and two bytes
-    # of unknown data
-    raw_pdu = bytes.fromhex(
-        "000001ac00000103000000000000587b000500497073756d496e666f00010134313731"
-        "37353130323033320000000000190001010424015e4c6f72656d20697073756d20646f"
-        "6c6f722073697420616d65742c20636f6e73656374657475722061646970697363696e"
-        "6720656c69742e205072616573656e74207669746165206e6571756520626962656e64"
-        "756d206f72636920636f6e67756520766573746962756c756d2e20446f6e6563207669"
-        "7461652074696e636964756e742072697375732e204d617572697320657520636f6e67"
-        "7565206573742e2053757370656e64697373652072686f6e637573206469616d207269"
-        "7375732e20496e2073656d7065722073656d207175697320636f6e64696d656e74756d"
-        "2072686f6e6375732e20496e2076656c2075726e612072697375732e204e616d207574"
-        "2070757275732073697420616d6574206c696265726f206c6163696e696120736f6c6c"
-        "696369747564696e2e20446f6e6563207072657469756d206f726e6172652064756920"
-        "696e206d616c65737561646120706f73756572652e0381000c34313731373531303230"
-        "333214010002f4e0")
-
-    p = pdu.PDU.new_from_raw(raw_pdu)
+    p = pdu.PDU.new_from_raw(RAW_DATA_SM_VENDOR_TLV)
     assert p.sequence_number == 22651
     assert p.payload_type == 0x01
     assert p.vendor_tag == b"\xf4\xe0"
 
 
-def test_fail_ostr_nonbytes():
-    p = pdu.PDU.new(constants.CMD_DATA_SM, message_payload="not binary")
-
-    with pytest.raises(PduParseError):
-        body = p.body
-
-
-def test_cmd_alert_notification():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.AlertNotification.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
-
-    p1 = pdu.PDU.new(constants.CMD_ALERT_NOTIFICATION, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
-
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
-
-
-def test_cmd_bind_transmitter():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.BindTransmitter.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
-
-    p1 = pdu.PDU.new(constants.CMD_BIND_TRANSMITTER, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
-
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
-
-
-def test_cmd_bind_transmitter_resp():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.BindTransmitterResp.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
-
-    p1 = pdu.PDU.new(constants.CMD_BIND_TRANSMITTER_RESP, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
-
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
+def test_parse_pdu_truncated():
+    # submit_sm that ends after source_addr_ton, in the middle of the integer
+    # parameters source_addr_ton and source_addr_npi
+    raw_pdu = bytes.fromhex("000000120000000400000000000000010005")
 
+    p = pdu.PDU.new_from_raw(raw_pdu)
+    assert p.service_type == ""
+    assert p.source_addr_ton == 5
+    assert p.source_addr_npi is None
 
-def test_cmd_cancel_sm():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.CancelSm.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
 
-    p1 = pdu.PDU.new(constants.CMD_CANCEL_SM, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
+def test_parse_pdu_unterminated_string():
+    # submit_sm_resp with a message_id that is missing the null terminator
+    raw_pdu = bytes.fromhex("0000001380000004000000000000000a616263")
 
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
+    with pytest.raises(PduParseError):
+        pdu.PDU.new_from_raw(raw_pdu)
 
 
-def test_cmd_cancel_sm_resp():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.CancelSmResp.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
+def test_parse_pdu_invalid_string():
+    # submit_sm_resp with a message_id that is not valid UTF-8
+    raw_pdu = bytes.fromhex("0000001380000004000000000000000aff6100")
 
-    p1 = pdu.PDU.new(constants.CMD_CANCEL_SM_RESP, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
+    with pytest.raises(PduParseError, match="message_id"):
+        pdu.PDU.new_from_raw(raw_pdu)
 
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
 
+def test_fail_ostr_nonbytes():
+    p = pdu.PDU.new(constants.CMD_DATA_SM, message_payload="not binary")
 
-def test_cmd_data_sm():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.DataSm.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
+    with pytest.raises(PduParseError, match="message_payload must be in bytes"):
+        p.body
 
-    p1 = pdu.PDU.new(constants.CMD_DATA_SM, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
 
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
+def test_pdu_params_not_shared():
+    p1 = pdu.PDU.new(constants.CMD_SUBMIT_MULTI, source_addr="pytest")
+    p2 = pdu.PDU.new(constants.CMD_SUBMIT_MULTI)
+    p1.dest_address.append({"dest_flag": 2, "dl_name": "list"})
 
+    assert p2.source_addr is None
+    assert p2.dest_address == []
+    assert p1.params["dest_address"].params["dl_name"] is not \
+           p2.params["dest_address"].params["dl_name"]
 
-def test_cmd_data_sm_resp():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.DataSmResp.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
 
-    p1 = pdu.PDU.new(constants.CMD_DATA_SM_RESP, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
+def test_list_param_encode_value():
+    p = pdu.PDU.new(constants.CMD_SUBMIT_MULTI, dest_address=[
+        {"dest_flag": 1, "dest_addr_ton": 1, "dest_addr_npi": 1,
+         "destination_addr": "4178481581"}])
+    dest_address = p.params["dest_address"]
 
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
+    assert p.body
+    assert dest_address.encoded == b"\x01\x01\x014178481581\x00"
+    # encoding list values leaves the element parameters untouched
+    assert dest_address.params["destination_addr"].data is None
 
 
-def test_cmd_deliver_sm_w_short_message():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.DeliverSm.params_config:
-        if field_name == "message_payload":
-            continue
-        pdu_args[field_name] = _field_value(field_type, field_params)
+def test_body_around():
+    p = pdu.PDU.new(constants.CMD_SUBMIT_SM, source_addr="sender",
+                    destination_addr="4178481581", short_message=b"test")
 
-    p1 = pdu.PDU.new(constants.CMD_DELIVER_SM, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
+    before, after = p.body_around("destination_addr")
+    assert before + b"4178481581\x00" + after == p.body
 
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
+    with pytest.raises(ValueError):
+        p.body_around("no_such_param")
 
 
-def test_cmd_deliver_sm_w_message_payload():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.DeliverSm.params_config:
-        if field_name == "short_message":
-            pdu_args[field_name] = b""
-        else:
-            pdu_args[field_name] = _field_value(field_type, field_params)
+def test_define_optional_param_len_param():
+    class VendorSubmitSm(pdu.SubmitSm):
+        pass
 
-    p1 = pdu.PDU.new(constants.CMD_DELIVER_SM, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
+    # length parameter that does not exist, and one that does
+    pdu.define_optional_param(VendorSubmitSm, pdu.OctetStringParam, 0x1500,
+                              "vendor_x", len_param="vendor_len")
+    pdu.define_optional_param(VendorSubmitSm, pdu.OctetStringParam, 0x1501,
+                              "vendor_y", len_param="sm_default_msg_id")
 
-    assert p2.sm_length == 0
+    p = VendorSubmitSm(short_message=b"test", sm_default_msg_id=3)
+    assert p.body.endswith(b"\x04test")
 
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
+    p = VendorSubmitSm(short_message=b"test", sm_default_msg_id=3,
+                       vendor_x=b"\xf4\xe0", vendor_y=b"\x01")
+    assert p.body.endswith(b"\x15\x00\x00\x02\xf4\xe0\x15\x01\x00\x01\x01")
+    assert p.sm_default_msg_id == 3
 
 
-def test_cmd_deliver_sm_resp():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.DeliverSmResp.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
+def test_define_optional_param_custom_type():
+    class ScaledIntegerParam(pdu.IntegerParam):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.scale = 2
 
-    p1 = pdu.PDU.new(constants.CMD_DELIVER_SM_RESP, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
+    class VendorDataSm(pdu.DataSm):
+        pass
 
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
+    pdu.define_optional_param(VendorDataSm, ScaledIntegerParam, 0x1403,
+                              "vendor_scaled", size=2)
 
+    p = VendorDataSm(vendor_scaled=5)
+    assert p.params["vendor_scaled"].scale == 2
+    assert p.body.endswith(b"\x14\x03\x00\x02\x00\x05")
 
-def test_cmd_enquire_link():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.EnquireLink.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
 
-    p1 = pdu.PDU.new(constants.CMD_ENQUIRE_LINK, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
+def test_define_optional_param_subclass():
+    class VendorDataSm(pdu.DataSm):
+        pass
 
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
+    class VendorDataSmSub(VendorDataSm):
+        pass
 
+    pdu.define_optional_param(VendorDataSm, pdu.OctetStringParam, 0x1402,
+                              "vendor_sub_tag", size=2)
 
-def test_cmd_enquire_link_resp():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.EnquireLinkResp.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
+    p = VendorDataSmSub(vendor_sub_tag=b"\xf4\xe0")
+    assert p.body.endswith(b"\x14\x02\x00\x02\xf4\xe0")
+    assert "vendor_sub_tag" not in pdu.DataSm().params
 
-    p1 = pdu.PDU.new(constants.CMD_ENQUIRE_LINK_RESP, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
+    # defining the same parameter again is ignored
+    config_length = len(VendorDataSm.params_config)
+    pdu.define_optional_param(VendorDataSm, pdu.OctetStringParam, 0x1402,
+                              "vendor_sub_tag", size=2)
+    assert len(VendorDataSm.params_config) == config_length
 
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
+
+# commands that round trip with a random value for every parameter
+ROUNDTRIP_COMMANDS = [
+    pdu.AlertNotification,
+    pdu.BindTransmitter,
+    pdu.BindTransmitterResp,
+    pdu.CancelSm,
+    pdu.CancelSmResp,
+    pdu.DataSm,
+    pdu.DataSmResp,
+    pdu.DeliverSmResp,
+    pdu.EnquireLink,
+    pdu.EnquireLinkResp,
+    pdu.GenericNack,
+    pdu.QuerySm,
+    pdu.QuerySmResp,
+    pdu.ReplaceSm,
+    pdu.ReplaceSmResp,
+    pdu.SubmitSmResp,
+    pdu.Unbind,
+    pdu.UnbindResp]
 
 
-def test_cmd_generic_nack():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.GenericNack.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
+@pytest.mark.parametrize("cmd_class", ROUNDTRIP_COMMANDS,
+                         ids=lambda cmd_class: cmd_class.command)
+def test_cmd_roundtrip(cmd_class):
+    pdu_args = _random_args(cmd_class)
 
-    p1 = pdu.PDU.new(constants.CMD_GENERIC_NACK, **pdu_args)
+    p1 = pdu.PDU.new(cmd_class.command_id, **pdu_args)
     p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
 
+    assert type(p2) is cmd_class
     for f in pdu_args.keys():
         assert getattr(p1, f) == getattr(p2, f)
 
 
-def test_cmd_query_sm():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.QuerySm.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
+def test_cmd_deliver_sm_w_short_message():
+    pdu_args = _random_args(pdu.DeliverSm, skip=("message_payload",))
 
-    p1 = pdu.PDU.new(constants.CMD_QUERY_SM, **pdu_args)
+    p1 = pdu.PDU.new(constants.CMD_DELIVER_SM, **pdu_args)
     p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
 
     for f in pdu_args.keys():
         assert getattr(p1, f) == getattr(p2, f)
 
 
-def test_cmd_query_sm_resp():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.QuerySmResp.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
+def test_cmd_deliver_sm_w_message_payload():
+    pdu_args = _random_args(pdu.DeliverSm, short_message=b"")
 
-    p1 = pdu.PDU.new(constants.CMD_QUERY_SM_RESP, **pdu_args)
+    p1 = pdu.PDU.new(constants.CMD_DELIVER_SM, **pdu_args)
     p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
 
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
-
-
-def test_cmd_replace_sm():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.ReplaceSm.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
-
-    p1 = pdu.PDU.new(constants.CMD_REPLACE_SM, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
+    assert p2.sm_length == 0
 
     for f in pdu_args.keys():
         assert getattr(p1, f) == getattr(p2, f)
 
 
-def test_cmd_replace_sm_resp():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.ReplaceSmResp.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
-
-    p1 = pdu.PDU.new(constants.CMD_REPLACE_SM_RESP, **pdu_args)
+def test_cmd_deliver_sm_wo_short_message():
+    p1 = pdu.PDU.new(constants.CMD_DELIVER_SM, source_addr="4178481581")
     p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
 
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
+    assert p2.sm_length == 0
+    assert p2.source_addr == "4178481581"
 
 
 def test_cmd_submit_multi():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.SubmitMulti.params_config:
-        if field_name == "dest_address":
-            pdu_args[field_name] = [
-                 {"dest_flag": 1, "dest_addr_ton": 1, "dest_addr_npi": 1, "destination_addr": "4178481581"},
-                 {"dest_flag": 1, "dest_addr_ton": 1, "dest_addr_npi": 1, "destination_addr": "4178481582"},
-                 {"dest_flag": 2, "dl_name": "distlist"},
-                 {"dest_flag": 1, "dest_addr_ton": 1, "dest_addr_npi": 1, "destination_addr": "4178481583"}
-             ]
-        elif field_name == "message_payload":
-            continue
-        else:
-            pdu_args[field_name] = _field_value(field_type, field_params)
+    pdu_args = _random_args(pdu.SubmitMulti, skip=("message_payload",),
+                            dest_address=SUBMIT_MULTI_DEST_ADDRESS)
 
     p1 = pdu.PDU.new(constants.CMD_SUBMIT_MULTI, **pdu_args)
     p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
@@ -418,17 +382,9 @@ def test_cmd_submit_multi():
 
 
 def test_cmd_submit_multi_resp():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.SubmitMultiResp.params_config:
-        if field_name == "unsuccess_sme":
-            pdu_args[field_name] = [
-                 {"dest_addr_ton": 1, "dest_addr_npi": 1, "destination_addr": "4178481581", "error_status_code": 4},
-                 {"dest_addr_ton": 1, "dest_addr_npi": 1, "destination_addr": "4178481582", "error_status_code": 5}
-             ]
-        elif field_name == "no_unsuccess":
-            pdu_args[field_name] = 2
-        else:
-            pdu_args[field_name] = _field_value(field_type, field_params)
+    pdu_args = _random_args(pdu.SubmitMultiResp,
+                            unsuccess_sme=SUBMIT_MULTI_RESP_UNSUCCESS_SME,
+                            no_unsuccess=2)
 
     p1 = pdu.PDU.new(constants.CMD_SUBMIT_MULTI_RESP, **pdu_args)
     p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
@@ -437,68 +393,35 @@ def test_cmd_submit_multi_resp():
         assert getattr(p1, f) == getattr(p2, f)
 
 
-def test_cmd_submit_sm_w_short_message():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.SubmitSm.params_config:
-        if field_name == "message_payload":
-            continue
-        pdu_args[field_name] = _field_value(field_type, field_params)
-
-    p1 = pdu.PDU.new(constants.CMD_SUBMIT_SM, **pdu_args)
+def test_cmd_submit_multi_resp_length_param():
+    unsuccess_sme = [
+        {"dest_addr_ton": 1, "dest_addr_npi": 1, "destination_addr": "4178481581", "error_status_code": 4}
+    ]
+    p1 = pdu.PDU.new(constants.CMD_SUBMIT_MULTI_RESP, message_id="abc",
+                     unsuccess_sme=unsuccess_sme)
     p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
 
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
+    assert p2.no_unsuccess == 1
+    assert p2.unsuccess_sme == unsuccess_sme
 
 
-def test_cmd_submit_sm_w_message_payload():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.SubmitSm.params_config:
-        if field_name == "short_message":
-            pdu_args[field_name] = b""
-        else:
-            pdu_args[field_name] = _field_value(field_type, field_params)
+def test_cmd_submit_sm_w_short_message():
+    pdu_args = _random_args(pdu.SubmitSm, skip=("message_payload",))
 
     p1 = pdu.PDU.new(constants.CMD_SUBMIT_SM, **pdu_args)
     p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
 
-    assert p2.sm_length == 0
-
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
-
-
-def test_cmd_submit_sm_resp():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.SubmitSmResp.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
-
-    p1 = pdu.PDU.new(constants.CMD_SUBMIT_SM_RESP, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
-
     for f in pdu_args.keys():
         assert getattr(p1, f) == getattr(p2, f)
 
 
-def test_cmd_unbind():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.Unbind.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
+def test_cmd_submit_sm_w_message_payload():
+    pdu_args = _random_args(pdu.SubmitSm, short_message=b"")
 
-    p1 = pdu.PDU.new(constants.CMD_UNBIND, **pdu_args)
+    p1 = pdu.PDU.new(constants.CMD_SUBMIT_SM, **pdu_args)
     p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
 
-    for f in pdu_args.keys():
-        assert getattr(p1, f) == getattr(p2, f)
-
-
-def test_cmd_unbind_resp():
-    pdu_args = {}
-    for field_name, field_type, field_params in pdu.UnbindResp.params_config:
-        pdu_args[field_name] = _field_value(field_type, field_params)
-
-    p1 = pdu.PDU.new(constants.CMD_UNBIND_RESP, **pdu_args)
-    p2 = pdu.PDU.new_from_raw(p1.header + p1.body)
+    assert p2.sm_length == 0
 
     for f in pdu_args.keys():
         assert getattr(p1, f) == getattr(p2, f)
@@ -73,18 +73,21 @@ def test_split_long_latin1():
     assert len(msg_parts) == 2
 
 
-def test_split_long_ucs2():
-    esm_class, data_coding, msg_parts = sm.split_short_message(
-        MSG_LONG, constants.DATA_CODING_UCS2)
+@pytest.fixture(scope="module")
+def split_long_ucs2():
+    return sm.split_short_message(MSG_LONG, constants.DATA_CODING_UCS2)
+
+
+def test_split_long_ucs2(split_long_ucs2):
+    esm_class, data_coding, msg_parts = split_long_ucs2
 
     assert esm_class == 0x40
     assert data_coding == constants.DATA_CODING_UCS2
     assert len(msg_parts) == 4
 
 
-def test_split_long_udh():
-    esm_class, data_coding, msg_parts = sm.split_short_message(
-        MSG_LONG, constants.DATA_CODING_UCS2)
+def test_split_long_udh(split_long_ucs2):
+    esm_class, data_coding, msg_parts = split_long_ucs2
 
     for msg_part in msg_parts:
         assert msg_part[0] == 0x05
@@ -97,3 +100,38 @@ def test_split_long_udh():
     # every identifier in every UDH must be equal
     identifiers = [m[3] for m in msg_parts]
     assert all(i == identifier for i in identifiers)
+
+
+def test_encode_binary_requires_bytes():
+    with pytest.raises(ValueError):
+        sm.encode_short_message(MSG_SHORT, constants.DATA_CODING_BINARY)
+
+
+def test_encode_unhandled_encoding():
+    with pytest.raises(ValueError):
+        sm.encode_short_message(MSG_SHORT, constants.DATA_CODING_JIS)
+
+
+def test_encode_gsm0338_non_ascii():
+    data, data_coding = sm.encode_short_message("Hellö, 5€ [ok]",
+                                                constants.DATA_CODING_DEFAULT)
+
+    assert data_coding == constants.DATA_CODING_DEFAULT
+    assert data == "Hellö, 5€ [ok]".encode("gsm0338")
+
+
+def test_split_encodes_once(monkeypatch):
+    calls = []
+
+    def encode_short_message(*args):
+        calls.append(args)
+        return encode(*args)
+
+    encode = sm.encode_short_message
+    monkeypatch.setattr(sm, "encode_short_message", encode_short_message)
+
+    esm_class, data_coding, msg_parts = sm.split_short_message(
+        MSG_LONG, constants.DATA_CODING_UCS2)
+
+    assert len(calls) == 1
+    assert len(msg_parts) == 4